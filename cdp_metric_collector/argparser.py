@@ -73,8 +73,9 @@ def parse(_args: "Sequence[str] | None" = None):
             },
             "hdfs": {
                 "disk-failures": Module(".export_hdfs_disk_failures"),
+                "jmx": Module(".export_hdfs_jmx"),
                 "usage-report": Module(".export_hdfs_usage_report"),
-                "utilization": Module(".export_hdfs_utilization", async_main=False),
+                "utilization": Module(".export_hdfs_utilization"),
             },
             "hive": {
                 "queries": Module(".export_hive_query"),
@@ -1,14 +1,25 @@
-__version__ = "r2025.10.01-0"
+__version__ = "r2026.10.19-2"
 
 
 import argparse
+import csv
 import logging
+import sys
+from asyncio.tasks import sleep as asleep
+from datetime import datetime
 from enum import Enum
+from io import TextIOWrapper
 from pathlib import Path
+from typing import cast
+
+from aiohttp import ClientError
+from httpx import HTTPError
 
 from cdp_metric_collector.cm_lib import config
 from cdp_metric_collector.cm_lib.cm import APICommand, CMAPIClient, CMAuth
+from cdp_metric_collector.cm_lib.errors import HTTPNotOK
 from cdp_metric_collector.cm_lib.utils import (
+    ABC,
     ARGSWithAuthBase,
     parse_auth,
     setup_logging,
@@ -18,6 +29,18 @@ TYPE_CHECKING = False
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
+    from cdp_metric_collector.cm_lib.hdfs import DFSHealth, NameNodeClient
+
+HeaderField = (
+    "Time",
+    "Command ID",
+    "Active",
+    "Min Utilization",
+    "Max Utilization",
+    "Spread",
+    "Bytes Moved",
+    "Next Poll",
+)
 logger = logging.getLogger(__name__)
 prog: str | None = None
 
@@ -25,6 +48,7 @@ prog: str | None = None
 class CMD(Enum):
     START = 0
     STOP = 1
+    WATCH = 2
 
 
 class Arguments(ARGSWithAuthBase):
@@ -32,6 +56,131 @@ class Arguments(ARGSWithAuthBase):
     parser: argparse.ArgumentParser
     command: CMD
     id: int | None
+    output: Path | int
+    threshold: float
+    until: datetime | None
+    min_interval: float
+    max_interval: float
+
+
+class UsageSample(ABC):
+    used: dict[str, int]
+    min_util: float
+    max_util: float
+
+    def __init__(self, health: "DFSHealth"):
+        self.used = {}
+        utils: list[float] = []
+        for bean in health.beans:
+            for host, node in bean.LiveNodes.by_host():
+                if (util := node.utilization) is not None:
+                    self.used[host] = cast("int", node.usedSpace)
+                    utils.append(util)
+        self.min_util = min(utils, default=0.0)
+        self.max_util = max(utils, default=0.0)
+
+    @property
+    def spread(self):
+        return self.max_util - self.min_util
+
+    def bytes_moved(self, last: "UsageSample | None"):
+        """estimated from per-node usage deltas, every moved byte leaves one node
+        and lands on another"""
+        if last is None:
+            return 0
+        delta = sum(
+            abs(used - last.used[host])
+            for host, used in self.used.items()
+            if host in last.used
+        )
+        return delta // 2
+
+
+def local_time(value: str):
+    """ISO format TIME as naive local time, converting it if an offset is set"""
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is not None:
+        dt = dt.astimezone().replace(tzinfo=None)
+    return dt
+
+
+async def poll_command(c: CMAPIClient, id: int):
+    try:
+        return await c.command(id)
+    except (ClientError, TimeoutError):
+        logger.warning("unable to poll command with ID %s", id, exc_info=True)
+        return None
+
+
+async def sample_usage(nn: "NameNodeClient"):
+    try:
+        return UsageSample(await nn.health_status())
+    except (HTTPError, HTTPNotOK):
+        logger.warning("unable to sample datanode usage", exc_info=True)
+        return None
+
+
+async def watch_rebalance(args: Arguments, c: CMAPIClient, rebalance: APICommand):
+    from cdp_metric_collector.cm_lib.hdfs import NameNodeClient
+
+    interval = args.min_interval
+    last: UsageSample | None = None
+    with TextIOWrapper(
+        open(args.output, "wb", 0),
+        encoding="utf-8",
+        newline="",
+        write_through=True,
+    ) as f:
+        fw = csv.writer(f)
+        fw.writerow(HeaderField)
+        async with NameNodeClient(config.HDFS_NAMENODE_HOST) as nn:
+            while True:
+                polled = await poll_command(c, rebalance.id)
+                rebalance = polled or rebalance
+                sample = await sample_usage(nn)
+                now = datetime.now()
+                fw.writerow(
+                    (
+                        now.isoformat(" ", "seconds"),
+                        rebalance.id,
+                        "" if polled is None else rebalance.active,
+                        *(
+                            (
+                                f"{sample.min_util:.2%}",
+                                f"{sample.max_util:.2%}",
+                                f"{sample.spread:.2%}",
+                                sample.bytes_moved(last),
+                            )
+                            if sample
+                            else ("", "", "", "")
+                        ),
+                        interval if rebalance.active else "",
+                    )
+                )
+                if not rebalance.active:
+                    logger.info("rebalance command with ID %s finished", rebalance.id)
+                    break
+                if sample and sample.spread * 100 < args.threshold:
+                    logger.info(
+                        "utilization spread %.2f%% is below threshold %.2f%%",
+                        sample.spread * 100,
+                        args.threshold,
+                    )
+                    rebalance = await c.rebalance_stop(rebalance.id)
+                    logger.info("rebalance command with ID %s stopped", rebalance.id)
+                    break
+                if args.until and now >= args.until:
+                    logger.info("maintenance window ended at %s", args.until)
+                    rebalance = await c.rebalance_stop(rebalance.id)
+                    logger.info("rebalance command with ID %s stopped", rebalance.id)
+                    break
+                last = sample or last
+                sleep = interval
+                if args.until:
+                    sleep = max(0.0, min(sleep, (args.until - now).total_seconds()))
+                await asleep(sleep)
+                interval = min(interval * 2, args.max_interval)
+    return rebalance
 
 
 async def main(_args: "Sequence[str] | None" = None):
@@ -47,7 +196,7 @@ async def main(_args: "Sequence[str] | None" = None):
             case CMD.START:
                 rebalance = await c.rebalance_start()
                 logger.info("started rebalance command with ID %s", rebalance.id)
-            case CMD.STOP:
+            case CMD.STOP | CMD.WATCH:
                 if args.id is not None:
                     rebalance = await c.command(args.id)
                     if rebalance.name != "Rebalance":
@@ -57,7 +206,9 @@ async def main(_args: "Sequence[str] | None" = None):
                         Path(config.HDFS_REBALANCE_STATUS).read_bytes()
                     )
                     rebalance = await c.command(last_status.id)
-                if not rebalance.active:
+                if args.command is CMD.WATCH:
+                    rebalance = await watch_rebalance(args, c, rebalance)
+                elif not rebalance.active:
                     logger.info(
                         "rebalance command with ID %s is already stoppped", rebalance.id
                     )
@@ -137,4 +288,63 @@ def parse_args(args: "Sequence[str] | None" = None):
         type=int,
         nargs="?",
     )
+    watch = subparser.add_parser(
+        "watch",
+        help="monitor rebalance command progress until it finishes",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    watch.set_defaults(command=CMD.WATCH, parser=watch)
+    watch.add_argument(
+        "id",
+        action="store",
+        metavar="ID",
+        help="watch rebalance command with ID",
+        type=int,
+        nargs="?",
+    )
+    watch.add_argument(
+        "-o",
+        action="store",
+        help="dump progress to FILE instead of stdout",
+        metavar="FILE",
+        type=Path,
+        default=sys.stdout.fileno(),
+        dest="output",
+    )
+    watch.add_argument(
+        "--threshold",
+        action="store",
+        help="stop rebalance once datanode utilization spread is below PERCENT",
+        metavar="PERCENT",
+        type=float,
+        default=10.0,
+        dest="threshold",
+    )
+    watch.add_argument(
+        "--until",
+        action="store",
+        help="stop rebalance at the end of maintenance window TIME (ISO format)",
+        metavar="TIME",
+        type=local_time,
+        default=None,
+        dest="until",
+    )
+    watch.add_argument(
+        "--min-interval",
+        action="store",
+        help="initial polling interval",
+        metavar="SECONDS",
+        type=float,
+        default=10.0,
+        dest="min_interval",
+    )
+    watch.add_argument(
+        "--max-interval",
+        action="store",
+        help="maximum polling interval after backing off",
+        metavar="SECONDS",
+        type=float,
+        default=300.0,
+        dest="max_interval",
+    )
     return parser.parse_args(args, Arguments())
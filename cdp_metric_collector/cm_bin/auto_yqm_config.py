@@ -1,13 +1,24 @@
-__version__ = "r2025.10.01-0"
+__version__ = "r2026.10.19-1"
 
 
 import logging
-from argparse import ArgumentParser, RawTextHelpFormatter
+from argparse import ArgumentParser, ArgumentTypeError, RawTextHelpFormatter
+from asyncio.locks import Semaphore
+from asyncio.tasks import gather
 from datetime import datetime
 from pathlib import Path
 
+from msgspec import DecodeError, Struct
+
 from cdp_metric_collector.cm_lib import config
-from cdp_metric_collector.cm_lib.cm import CMAuth, YQMCLient, YQMOperator, YQMQueueACL
+from cdp_metric_collector.cm_lib.cm import (
+    CMAuth,
+    YarnQMSnapshot,
+    YQMCLient,
+    YQMOperator,
+    YQMQueueACL,
+)
+from cdp_metric_collector.cm_lib.structs import Decodable
 from cdp_metric_collector.cm_lib.utils import (
     ARGSWithAuthBase,
     parse_auth,
@@ -22,15 +33,95 @@ logger = logging.getLogger(__name__)
 prog: str | None = None
 
 
+class PlanChange(Struct, forbid_unknown_fields=True):
+    pool: str
+    add_users: list[str] = []
+    remove_users: list[str] = []
+    add_groups: list[str] = []
+    remove_groups: list[str] = []
+
+    @property
+    def users(self):
+        return [YQMQueueACL(x, YQMOperator.ADD) for x in self.add_users] + [
+            YQMQueueACL(x, YQMOperator.REM) for x in self.remove_users
+        ]
+
+    @property
+    def groups(self):
+        return [YQMQueueACL(x, YQMOperator.ADD) for x in self.add_groups] + [
+            YQMQueueACL(x, YQMOperator.REM) for x in self.remove_groups
+        ]
+
+
+class Plan(Decodable):
+    changes: list[PlanChange]
+
+    @classmethod
+    def from_path(cls, path: str):
+        """argparse type, unreadable or invalid plans are usage errors"""
+        try:
+            data = Path(path).read_bytes()
+            if path.endswith(".json"):
+                return cls.decode_json(data)
+            return cls.decode_yaml(data)
+        except (OSError, DecodeError) as e:
+            err = f"unable to load plan {path}: {e}"
+            raise ArgumentTypeError(err) from e
+
+    def merged(self):
+        """{pool: (users, groups)} in plan order"""
+        result: dict[str, tuple[list[YQMQueueACL], list[YQMQueueACL]]] = {}
+        for change in self.changes:
+            users, groups = result.setdefault(change.pool, ([], []))
+            users.extend(change.users)
+            groups.extend(change.groups)
+        return result
+
+
 class Arguments(ARGSWithAuthBase):
     verbose: bool
     parser: ArgumentParser
-    pool: str
+    pool: str | None
+    plan: Plan | None
+    concurrency: int
     snapshot_path: Path
+    yqm_file: Path | None
     users: list[YQMQueueACL]
     groups: list[YQMQueueACL]
 
 
+async def apply_plan(c: YQMCLient, plan: Plan, last_states: dict[str, str], n: int):
+    sem = Semaphore(n)
+
+    async def update(pool: str, users: list[YQMQueueACL], groups: list[YQMQueueACL]):
+        async with sem:
+            logger.info("using last state: %r for pool %s", last_states[pool], pool)
+            return await c.update_config(pool, last_states[pool], users, groups)
+
+    changes = plan.merged()
+    for pool in [p for p in changes if p not in last_states]:
+        logger.warning("skipping pool %s, no such queue", pool)
+        del changes[pool]
+    results = await gather(
+        *(update(p, u, g) for p, (u, g) in changes.items()),
+        return_exceptions=True,
+    )
+    failed = 0
+    for pool, result in zip(changes, results, strict=True):
+        if isinstance(result, Exception):
+            logger.error("unable to update pool %s: %s", pool, result)
+            failed += 1
+    logger.info(
+        "updated %s pools, %s unchanged, %s failed",
+        results.count(True),
+        results.count(False),
+        failed,
+    )
+    if failed:
+        err = f"{failed} pool update(s) failed"
+        raise RuntimeError(err)
+
+
 async def main(_args: "Sequence[str] | None" = None):
     args = parse_args(_args)
     setup_logging(("cdp_metric_collector",), debug=args.verbose)
@@ -42,16 +133,24 @@ async def main(_args: "Sequence[str] | None" = None):
         args.parser.error("No auth mechanism is passed")
 
     async with YQMCLient(config.CM_HOST, auth) as c:
-        snapshot = await c.get_config()
-        snapshot.serialize_to_csv(
-            args.snapshot_path / f"yqm_snapshot_{datetime.now().timestamp()}.csv"
-        )
-        last_state = ""
-        for q in snapshot.queues:
-            if q.queuePath == args.pool:
-                last_state = q.properties.aclSubmit
-                logger.info("using last state: %r", last_state)
-        await c.update_config(args.pool, last_state, args.users, args.groups)
+        if args.yqm_file:
+            yqm = YarnQMSnapshot.decode_msgpack(args.yqm_file.read_bytes())
+            logger.info("using queue snapshot taken at %s", yqm.createdAt)
+            last_states = {k: v.aclSubmit for k, v in yqm.queues.items()}
+        else:
+            snapshot = await c.get_config()
+            snapshot.serialize_to_csv(
+                args.snapshot_path / f"yqm_snapshot_{datetime.now().timestamp()}.csv"
+            )
+            last_states = {
+                k: v.properties.aclSubmit for k, v in snapshot.index().items()
+            }
+        if args.plan:
+            await apply_plan(c, args.plan, last_states, args.concurrency)
+        elif args.pool:
+            last_state = last_states.get(args.pool, "")
+            logger.info("using last state: %r", last_state)
+            await c.update_config(args.pool, last_state, args.users, args.groups)
 
 
 def parse_args(args: "Sequence[str] | None" = None):
@@ -108,15 +207,40 @@ def parse_args(args: "Sequence[str] | None" = None):
         default=[],
         dest="groups",
     )
-    parser.add_argument(
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument(
         "--pool",
         "--queue",
         action="store",
         metavar="NAME",
         type=str,
-        required=True,
+        default=None,
         dest="pool",
     )
+    target.add_argument(
+        "--plan",
+        action="store",
+        help="apply ACL changes for many pools from plan FILE (YAML or JSON)\n"
+        "changes:\n"
+        "  - pool: root.team.queue\n"
+        "    add_users: [user1, user2]\n"
+        "    remove_users: []\n"
+        "    add_groups: [group1]\n"
+        "    remove_groups: []",
+        metavar="FILE",
+        type=Plan.from_path,
+        default=None,
+        dest="plan",
+    )
+    parser.add_argument(
+        "--concurrency",
+        action="store",
+        help="maximum concurrent pool updates when using --plan (default: 4)",
+        metavar="NUM",
+        type=int,
+        default=4,
+        dest="concurrency",
+    )
     parser.add_argument(
         "--snapshot-path",
         action="store",
@@ -125,6 +249,16 @@ def parse_args(args: "Sequence[str] | None" = None):
         default=Path.cwd(),
         dest="snapshot_path",
     )
+    parser.add_argument(
+        "--yqm-file",
+        action="store",
+        help="use last ACL state from msgpack snapshot FILE instead of fetching\n"
+        "(see `export yarn queues --snapshot`)",
+        metavar="FILE",
+        type=Path,
+        default=None,
+        dest="yqm_file",
+    )
     auth = parser.add_argument_group("authentication")
     auth.add_argument(
         "-c",
@@ -1,12 +1,17 @@
-__version__ = "r2025.10.01-0"
+__version__ = "r2026.10.19-1"
 
 
 import csv
 import logging
 import sys
 from argparse import ArgumentDefaultsHelpFormatter, ArgumentParser
+from asyncio.tasks import sleep as asleep
+from datetime import datetime
+from io import TextIOWrapper
 from pathlib import Path
 
+from aiohttp import ClientError
+
 from cdp_metric_collector.cm_lib import config
 from cdp_metric_collector.cm_lib.cm import CMAPIClient, CMAuth, HealthIssues
 from cdp_metric_collector.cm_lib.utils import (
@@ -19,6 +24,15 @@ TYPE_CHECKING = False
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
+HeaderField = (
+    "Test ID",
+    "Health Issue",
+    "Status",
+    "Entity",
+    "Type",
+    "Hostname",
+    "Cluster",
+)
 logger = logging.getLogger(__name__)
 prog: str | None = None
 
@@ -28,6 +42,7 @@ class Arguments(ARGSWithAuthBase):
     verbose: bool
     output: Path | int
     health_file: Path | None
+    watch: float | None
 
 
 async def fetch_health_issues(auth: CMAuth):
@@ -35,12 +50,57 @@ async def fetch_health_issues(auth: CMAuth):
         return await c.health_issues()
 
 
+async def watch_health_issues(auth: CMAuth, interval: float, fw: "csv._writer"):
+    last: dict[tuple[str, str], tuple[str, ...]] = {}
+    async with CMAPIClient(config.CM_HOST, auth) as c:
+        while True:
+            try:
+                current = (await c.health_issues()).indexed()
+            except (ClientError, TimeoutError):
+                logger.warning("unable to fetch health issues", exc_info=True)
+                await asleep(interval)
+                continue
+            now = datetime.now().isoformat(" ", "seconds")
+            opened = sorted(current.keys() - last.keys())
+            resolved = sorted(last.keys() - current.keys())
+            changed = sorted(
+                k for k in current.keys() & last.keys() if current[k][2] != last[k][2]
+            )
+            logger.debug(
+                "%s opened, %s resolved, %s changed",
+                len(opened),
+                len(resolved),
+                len(changed),
+            )
+            fw.writerows((now, "Opened", *current[k]) for k in opened)
+            fw.writerows((now, "Changed", *current[k]) for k in changed)
+            fw.writerows((now, "Resolved", *last[k]) for k in resolved)
+            last = current
+            await asleep(interval)
+
+
 async def main(_args: "Sequence[str] | None" = None):
     args = parse_args(_args)
     setup_logging(("cdp_metric_collector",), debug=args.verbose)
     logger.debug("got args %s", args)
 
     config.load_all()
+    if args.watch is not None:
+        if (auth := args.get_auth()) is None:
+            args.parser.error("No auth mechanism is passed")
+        if args.health_file:
+            args.parser.error("--watch can not be used with --health-file")
+        with TextIOWrapper(
+            open(args.output, "wb", 0),
+            encoding="utf-8",
+            newline="",
+            write_through=True,
+        ) as outf:
+            fw = csv.writer(outf)
+            fw.writerow(("Time", "Event", *HeaderField))
+            await watch_health_issues(auth, args.watch, fw)
+        return
+
     match args.get_auth(), args.health_file:
         case CMAuth() as auth, None:
             health_issues = await fetch_health_issues(auth)
@@ -51,17 +111,7 @@ async def main(_args: "Sequence[str] | None" = None):
 
     with open(args.output, "w", encoding="utf-8", newline="") as outf:
         fw = csv.writer(outf)
-        fw.writerow(
-            (
-                "Test ID",
-                "Health Issue",
-                "Status",
-                "Entity",
-                "Type",
-                "Hostname",
-                "Cluster",
-            )
-        )
+        fw.writerow(HeaderField)
         fw.writerows(health_issues)
 
 
@@ -116,6 +166,16 @@ def parse_args(args: "Sequence[str] | None" = None):
         default=None,
         dest="health_file",
     )
+    parser.add_argument(
+        "--watch",
+        action="store",
+        help="keep polling every SECONDS and only write opened, resolved and "
+        "status changed issues",
+        metavar="SECONDS",
+        type=float,
+        default=None,
+        dest="watch",
+    )
     auth.add_argument(
         "-u",
         action="store",
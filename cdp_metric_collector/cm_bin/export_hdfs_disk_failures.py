@@ -1,10 +1,12 @@
-__version__ = "r2025.10.01-0"
+__version__ = "r2026.10.19-2"
 
 
 import csv
 import logging
+import sqlite3
 import sys
 from argparse import ArgumentDefaultsHelpFormatter, ArgumentParser
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
@@ -18,6 +20,19 @@ TYPE_CHECKING = False
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
+    from cdp_metric_collector.cm_lib.hdfs.structs import NodeStatus
+
+HeaderField = (
+    "Hostname",
+    "IP",
+    "Status",
+    "Last Contact",
+    "Storage ID",
+    "Last Failure Date",
+    "Event",
+    "First Seen",
+    "Last Seen",
+)
 logger = logging.getLogger(__name__)
 prog: str | None = None
 
@@ -26,6 +41,144 @@ class Arguments(ARGSBase):
     file: Path | None
     output: Path | None
     verbose: bool
+    db: Path
+    report_all: bool
+    no_db: bool
+
+
+@contextmanager
+def open_db(fp: "Path | str"):
+    with sqlite3.connect(fp) as conn:
+        cursor = conn.executescript(
+            "PRAGMA journal_mode = WAL; PRAGMA synchronous = NORMAL;"
+        )
+        cursor.execute("""CREATE TABLE IF NOT EXISTS volume_failure (
+        datanode TEXT NOT NULL,
+        storage_id TEXT NOT NULL,
+        first_seen INTEGER NOT NULL,
+        last_seen INTEGER NOT NULL,
+        recovered INTEGER,
+        CONSTRAINT PK PRIMARY KEY (datanode,storage_id)) WITHOUT ROWID""")
+        cursor.execute("""CREATE INDEX IF NOT EXISTS volume_failure_active
+        ON volume_failure (recovered, datanode)""")
+        try:
+            yield cursor
+        finally:
+            conn.commit()
+            cursor.execute("PRAGMA optimize")
+            cursor.close()
+
+
+def fmt_time(ts: int):
+    return datetime.fromtimestamp(ts).isoformat(" ", "seconds")
+
+
+def last_failure(s: "NodeStatus"):
+    if s.lastVolumeFailureDate is UNSET:
+        return ""
+    return datetime.fromtimestamp(s.lastVolumeFailureDate / 1000).isoformat(
+        " ", "milliseconds"
+    )
+
+
+def failed_storages(s: "NodeStatus"):
+    """failed storage ids of a live node, volumes of namenodes not reporting
+    the ids are tracked under an empty id"""
+    if s.volfails is UNSET or s.volfails < 1:
+        return []
+    if s.failedStorageIDs is UNSET or not s.failedStorageIDs:
+        return [""]
+    return s.failedStorageIDs
+
+
+def report_delta(
+    cursor: sqlite3.Cursor,
+    fw: "csv._writer",
+    h: DFSHealth,
+    now: int,
+    report_all: bool,
+):
+    """update volume failure history and write volumes that failed or
+    recovered since the previous run, or every failing volume if report_all.
+    volumes of dead or unreported nodes are kept as they are"""
+    active: dict[str, dict[str, int]] = {}
+    for host, sid, first in cursor.execute(
+        "SELECT datanode, storage_id, first_seen FROM volume_failure "
+        "WHERE recovered IS NULL"
+    ):
+        active.setdefault(host, {})[sid] = first
+    seen: list[tuple[int, str, str]] = []
+    for i in h.beans:
+        for host, s in i.LiveNodes.by_host():
+            failing = active.pop(host, {})
+            for sid in failed_storages(s):
+                if (first := failing.pop(sid, None)) is None:
+                    cursor.execute(
+                        "INSERT INTO volume_failure VALUES (?,?,?,?,NULL) "
+                        "ON CONFLICT (datanode,storage_id) DO UPDATE SET "
+                        "first_seen = excluded.first_seen, "
+                        "last_seen = excluded.last_seen, recovered = NULL",
+                        (host, sid, now, now),
+                    )
+                    event, first = "failed", now
+                else:
+                    seen.append((now, host, sid))
+                    if not report_all:
+                        continue
+                    event = "failing"
+                fw.writerow(
+                    (
+                        host,
+                        s.xferhost,
+                        "Live",
+                        fmt_time(now - s.lastContact),
+                        sid,
+                        last_failure(s),
+                        event,
+                        fmt_time(first),
+                        fmt_time(now),
+                    )
+                )
+            # volumes still recorded as failed but no longer reported by a live
+            # node have been replaced or came back
+            for sid, first in failing.items():
+                cursor.execute(
+                    "UPDATE volume_failure SET recovered = ? "
+                    "WHERE datanode = ? AND storage_id = ?",
+                    (now, host, sid),
+                )
+                fw.writerow(
+                    (
+                        host,
+                        s.xferhost,
+                        "Live",
+                        fmt_time(now - s.lastContact),
+                        sid,
+                        last_failure(s),
+                        "recovered",
+                        fmt_time(first),
+                        fmt_time(now),
+                    )
+                )
+        if report_all:
+            for host, s in i.DeadNodes.by_host():
+                fw.writerow(
+                    (
+                        host,
+                        s.xferhost,
+                        "Dead",
+                        fmt_time(now - s.lastContact),
+                        "",
+                        "",
+                        "dead",
+                        "",
+                        "",
+                    )
+                )
+    cursor.executemany(
+        "UPDATE volume_failure SET last_seen = ? WHERE datanode = ? AND storage_id = ?",
+        seen,
+    )
 
 
 async def fetch_health():
@@ -50,6 +203,14 @@ async def main(_args: "Sequence[str] | None" = None):
         newline="",
     ) as f:
         fw = csv.writer(f)
+        if not args.no_db:
+            args.db.parent.mkdir(parents=True, exist_ok=True)
+            fw.writerow(HeaderField)
+            with open_db(args.db) as cursor:
+                report_delta(
+                    cursor, fw, h, int(datetime.now().timestamp()), args.report_all
+                )
+            return
         fw.writerow(
             (
                 "Hostname",
@@ -62,22 +223,15 @@ async def main(_args: "Sequence[str] | None" = None):
         )
         now = datetime.now().timestamp()
         for i in h.beans:
-            for n, s in i.LiveNodes.items():
+            for host, s in i.LiveNodes.by_host():
                 if s.volfails is not UNSET and s.volfails > 0:
                     last_contact = datetime.fromtimestamp(
                         now - s.lastContact
                     ).isoformat(" ", "seconds")
-                    last_failure = (
-                        datetime.fromtimestamp(
-                            s.lastVolumeFailureDate / 1000
-                        ).isoformat(" ", "milliseconds")
-                        if s.lastVolumeFailureDate is not UNSET
-                        else ""
-                    )
                     fw.writerow(
                         (
-                            n.host,
-                            s.xferaddr.host,
+                            host,
+                            s.xferhost,
                             "Live",
                             last_contact,
                             (
@@ -85,14 +239,14 @@ async def main(_args: "Sequence[str] | None" = None):
                                 if s.failedStorageIDs is not UNSET
                                 else ""
                             ),
-                            last_failure,
+                            last_failure(s),
                         )
                     )
-            for n, s in i.DeadNodes.items():
+            for host, s in i.DeadNodes.by_host():
                 last_contact = datetime.fromtimestamp(now - s.lastContact).isoformat(
                     " ", "seconds"
                 )
-                fw.writerow((n.host, s.xferaddr.host, "Dead", last_contact))
+                fw.writerow((host, s.xferhost, "Dead", last_contact))
 
 
 def parse_args(args: "Sequence[str] | None" = None):
@@ -134,4 +288,26 @@ def parse_args(args: "Sequence[str] | None" = None):
         default=None,
         dest="file",
     )
+    parser.add_argument(
+        "--db",
+        action="store",
+        help="keep volume failure history in sqlite FILE, only volumes that "
+        "failed or recovered since the previous run are reported",
+        metavar="FILE",
+        type=Path,
+        default=config.PATH / "hdfs_volume_failures.db",
+        dest="db",
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="also report volumes that are still failing and dead nodes",
+        dest="report_all",
+    )
+    parser.add_argument(
+        "--no-db",
+        action="store_true",
+        help="report every failing volume and dead node without keeping history",
+        dest="no_db",
+    )
     return parser.parse_args(args, Arguments())
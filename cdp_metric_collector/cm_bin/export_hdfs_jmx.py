@@ -0,0 +1,193 @@
+__version__ = "r2026.10.19-2"
+
+
+import csv
+import logging
+import sqlite3
+import sys
+from argparse import ArgumentDefaultsHelpFormatter, ArgumentParser
+from asyncio.tasks import sleep as asleep
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+from io import TextIOWrapper
+from pathlib import Path
+
+from httpx import HTTPError
+from msgspec import UNSET
+
+from cdp_metric_collector.cm_lib import config
+from cdp_metric_collector.cm_lib.errors import HTTPNotOK
+from cdp_metric_collector.cm_lib.hdfs import NameNodeClient
+from cdp_metric_collector.cm_lib.utils import ARGSBase, setup_logging
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from cdp_metric_collector.cm_lib.hdfs import DFSHealth
+
+HeaderField = (
+    "Time",
+    "Host",
+    "HA State",
+    "Bean",
+    "Metric",
+    "Value",
+)
+logger = logging.getLogger(__name__)
+prog: str | None = None
+
+
+class Arguments(ARGSBase):
+    verbose: bool
+    output: Path | int
+    watch: float | None
+    capacity_db: Path | None
+
+
+@contextmanager
+def open_db(fp: "Path | str"):
+    with sqlite3.connect(fp) as conn:
+        cursor = conn.executescript(
+            "PRAGMA journal_mode = WAL; PRAGMA synchronous = NORMAL;"
+        )
+        cursor.execute("""CREATE TABLE IF NOT EXISTS datanode (
+        id INTEGER PRIMARY KEY,
+        host TEXT NOT NULL UNIQUE)""")
+        cursor.execute("""CREATE TABLE IF NOT EXISTS datanode_capacity (
+        datanode INTEGER NOT NULL REFERENCES datanode (id),
+        `timestamp` INTEGER NOT NULL,
+        live INTEGER NOT NULL,
+        used INTEGER,
+        capacity INTEGER,
+        remaining INTEGER,
+        blocks INTEGER,
+        volfails INTEGER,
+        CONSTRAINT PK PRIMARY KEY (datanode,`timestamp`)) WITHOUT ROWID""")
+        try:
+            yield cursor
+        finally:
+            conn.commit()
+            cursor.execute("PRAGMA optimize")
+            cursor.close()
+
+
+def store_capacity(
+    cursor: sqlite3.Cursor,
+    ids: dict[str, int],
+    time: datetime,
+    health: "DFSHealth",
+):
+    """append one row per datanode, timestamp is stored as epoch seconds and
+    hosts as ids of the datanode table"""
+    rows: list[tuple[str, bool, object, object, object, object, object]] = []
+    for bean in health.beans:
+        for live, nodes in ((True, bean.LiveNodes), (False, bean.DeadNodes)):
+            for host, s in nodes.by_host():
+                rows.append(
+                    (
+                        host,
+                        live,
+                        None if s.usedSpace is UNSET else s.usedSpace,
+                        None if s.capacity is UNSET else s.capacity,
+                        None if s.remaining is UNSET else s.remaining,
+                        None if s.numBlocks is UNSET else s.numBlocks,
+                        None if s.volfails is UNSET else s.volfails,
+                    )
+                )
+    if new := [(x[0],) for x in rows if x[0] not in ids]:
+        cursor.executemany("INSERT OR IGNORE INTO datanode (host) VALUES (?)", new)
+        ids.update(cursor.execute("SELECT host, id FROM datanode").fetchall())
+    ts = int(time.timestamp())
+    cursor.executemany(
+        "INSERT OR REPLACE INTO datanode_capacity VALUES (?,?,?,?,?,?,?,?)",
+        ((ids[host], ts, *values) for host, *values in rows),
+    )
+    cursor.connection.commit()
+    logger.debug("stored capacity of %s datanodes", len(rows))
+
+
+async def main(_args: "Sequence[str] | None" = None):
+    args = parse_args(_args)
+    setup_logging(("cdp_metric_collector",), debug=args.verbose)
+    logger.debug("got args %s", args)
+
+    config.load_all()
+    with TextIOWrapper(
+        open(args.output, "wb", 0),
+        encoding="utf-8",
+        newline="",
+        write_through=True,
+    ) as f:
+        fw = csv.writer(f)
+        fw.writerow(HeaderField)
+        with ExitStack() as stack:
+            cursor = None
+            ids: dict[str, int] = {}
+            if args.capacity_db:
+                cursor = stack.enter_context(open_db(args.capacity_db))
+            async with NameNodeClient(config.HDFS_NAMENODE_HOST) as nn:
+                while True:
+                    snapshot = await nn.snapshot()
+                    fw.writerows(snapshot.rows())
+                    if cursor is not None:
+                        try:
+                            health = await nn.health_status()
+                        except (HTTPError, HTTPNotOK) as e:
+                            logger.warning("unable to query datanode capacity: %s", e)
+                        else:
+                            store_capacity(cursor, ids, snapshot.time, health)
+                    if args.watch is None:
+                        break
+                    await asleep(args.watch)
+
+
+def parse_args(args: "Sequence[str] | None" = None):
+    parser = ArgumentParser(
+        prog=prog,
+        add_help=False,
+        formatter_class=ArgumentDefaultsHelpFormatter,
+    )
+    misc = parser.add_argument_group()
+    misc.add_argument("-h", "--help", action="help", help="print this help and exit")
+    misc.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="enable verbose mode",
+        dest="verbose",
+    )
+    misc.add_argument(
+        "--version",
+        action="version",
+        help="print version",
+        version=f"%(prog)s {__version__}",
+    )
+    parser.add_argument(
+        "-o",
+        action="store",
+        help="dump result to FILE instead of stdout",
+        metavar="FILE",
+        type=Path,
+        default=sys.stdout.fileno(),
+        dest="output",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store",
+        help="take a snapshot every SECONDS instead of once",
+        metavar="SECONDS",
+        type=float,
+        default=None,
+        dest="watch",
+    )
+    parser.add_argument(
+        "--capacity-db",
+        action="store",
+        help="also append per-datanode capacity of each snapshot to sqlite FILE",
+        metavar="FILE",
+        type=Path,
+        default=None,
+        dest="capacity_db",
+    )
+    return parser.parse_args(args, Arguments())
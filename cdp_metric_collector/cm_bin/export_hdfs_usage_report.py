@@ -1,25 +1,43 @@
-__version__ = "r2026.06.05-2"
+__version__ = "r2026.10.19-1"
 
 
 import csv
 import logging
+import os
 import sys
 from argparse import ArgumentParser, RawTextHelpFormatter
+from asyncio.events import get_running_loop
+from asyncio.tasks import as_completed
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from enum import Enum
 from io import TextIOWrapper
 
 from cdp_metric_collector.cm_lib import config
 from cdp_metric_collector.cm_lib.cm import CMAPIClient, CMAuth
+from cdp_metric_collector.cm_lib.hdfs import HDFSClient, WalkEntry, walk
+from cdp_metric_collector.cm_lib.hdfs.fsimage import (
+    DelimitedAggregator,
+    XMLAggregator,
+    delimited_header,
+    is_xml,
+    parse_delimited,
+    parse_xml,
+    shards,
+)
 from cdp_metric_collector.cm_lib.utils import (
     ARGSWithAuthBase,
     parse_auth,
     setup_logging,
+    wrap_async,
 )
 
 TYPE_CHECKING = False
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
+    from cdp_metric_collector.cm_lib.cm.structs import FileBrowserPathJSON
+
 HeaderField = (
     "Depth",
     "Mode",
@@ -38,9 +56,23 @@ logger = logging.getLogger(__name__)
 prog: str | None = None
 
 
+class Backend(Enum):
+    CM = "cm"
+    WEBHDFS = "webhdfs"
+
+    def __str__(self):
+        return self.value
+
+
 class Arguments(ARGSWithAuthBase):
     verbose: bool
     parser: ArgumentParser
+    backend: Backend
+    concurrency: int
+    summary: bool
+    fsimage: str | None
+    delimiter: str
+    jobs: int
     path: list[str]
     date_older: datetime | None
     date_newer: datetime | None
@@ -50,32 +82,77 @@ class Arguments(ARGSWithAuthBase):
 
 
 async def main(_args: "Sequence[str] | None" = None):
+    def selected(fp: "FileBrowserPathJSON | WalkEntry"):
+        if args.dir_only and not fp.is_dir():
+            return False
+        mtime = datetime.fromtimestamp(fp.mtime / 1000)
+        return (args.date_newer is None or args.date_newer < mtime) and (
+            args.date_older is None or mtime < args.date_older
+        )
+
     async def fetch_data(client: CMAPIClient, base_path: str):
         async for fp in client.file_browser(base_path):
             level = fp.path.count("/") - first_level
-            mtime = datetime.fromtimestamp(fp.mtime / 1000)
             if args.max_level is None or level <= args.max_level:
-                if fp.is_dir():
-                    if (args.date_newer is None or args.date_newer < mtime) and (
-                        args.date_older is None or mtime < args.date_older
-                    ):
-                        yield (level, *fp)
-                    if args.max_level is None or level < args.max_level:
-                        async for r in fetch_data(client, fp.path):
-                            yield r
-                elif not args.dir_only:
-                    if (args.date_newer is None or args.date_newer < mtime) and (
-                        args.date_older is None or mtime < args.date_older
-                    ):
-                        yield (level, *fp)
+                if selected(fp):
+                    yield (level, *fp)
+                if fp.is_dir() and (args.max_level is None or level < args.max_level):
+                    async for r in fetch_data(client, fp.path):
+                        yield r
+
+    async def fetch_data_webhdfs(client: HDFSClient, base_path: str):
+        async for level, fp in walk(
+            client,
+            base_path,
+            args.max_level,
+            args.concurrency,
+            args.summary,
+            selected,
+        ):
+            yield (level, *fp)
+
+    async def fetch_data_fsimage(fp: str, base_paths: list[str]):
+        agg_args = (
+            base_paths,
+            args.max_level,
+            args.dir_only,
+            args.date_newer,
+            args.date_older,
+        )
+        if is_xml(fp):
+            logger.info("parsing xml fsimage %s", fp)
+            agg = await wrap_async(parse_xml, fp, XMLAggregator(*agg_args))
+        else:
+            columns, start = delimited_header(fp, args.delimiter)
+            parts = shards(fp, start, args.jobs * 4)
+            logger.info("parsing delimited fsimage %s in %s shards", fp, len(parts))
+            agg = DelimitedAggregator(*agg_args)
+            loop = get_running_loop()
+            with ProcessPoolExecutor(args.jobs) as pool:
+                for task in as_completed(
+                    [
+                        loop.run_in_executor(
+                            pool,
+                            parse_delimited,
+                            fp,
+                            begin,
+                            end,
+                            columns,
+                            args.delimiter,
+                            DelimitedAggregator(*agg_args),
+                        )
+                        for begin, end in parts
+                    ]
+                ):
+                    agg.merge(await task)
+        for n in range(len(base_paths)):
+            for row in agg.rows(n):
+                yield row
 
     args = parse_args(_args)
     setup_logging(("cdp_metric_collector",), debug=args.verbose)
     logger.debug("got args %s", args)
     config.load_all()
-    auth = args.get_auth()
-    if not auth:
-        args.parser.error("No auth mechanism is passed")
     with TextIOWrapper(
         open(args.output or sys.stdout.fileno(), "wb", 0),
         encoding="utf-8",
@@ -84,13 +161,33 @@ async def main(_args: "Sequence[str] | None" = None):
     ) as f:
         out = csv.writer(f)
         out.writerow(HeaderField)
-        async with CMAPIClient(config.CM_HOST, auth) as c:
-            for p in args.path:
-                if not p.startswith("/"):
-                    logger.warning("skipping path: %s, path must be absolute", p)
-                first_level = p.count("/")
-                async for row in fetch_data(c, p):
-                    out.writerow(row)
+        paths: list[str] = []
+        for p in args.path:
+            if not p.startswith("/"):
+                logger.warning("skipping path: %s, path must be absolute", p)
+                continue
+            paths.append(p)
+        if args.fsimage:
+            async for row in fetch_data_fsimage(args.fsimage, paths):
+                out.writerow(row)
+            return
+        match args.backend:
+            case Backend.CM:
+                auth = args.get_auth()
+                if not auth:
+                    args.parser.error("No auth mechanism is passed")
+                async with CMAPIClient(config.CM_HOST, auth) as c:
+                    for p in paths:
+                        first_level = p.count("/")
+                        async for row in fetch_data(c, p):
+                            out.writerow(row)
+            case Backend.WEBHDFS:
+                async with HDFSClient(
+                    config.HDFS_NAMENODE_HOST, max_connections=args.concurrency
+                ) as c:
+                    for p in paths:
+                        async for row in fetch_data_webhdfs(c, p):
+                            out.writerow(row)
 
 
 def parse_args(args: "Sequence[str] | None" = None):
@@ -163,6 +260,57 @@ def parse_args(args: "Sequence[str] | None" = None):
         default=None,
         type=int,
     )
+    parser.add_argument(
+        "--backend",
+        action="store",
+        help="listing source, cm file browser or webhdfs (default: %(default)s)",
+        type=Backend,
+        choices=tuple(Backend),
+        default=Backend.CM,
+        dest="backend",
+    )
+    parser.add_argument(
+        "--concurrency",
+        action="store",
+        help="number of concurrent webhdfs requests (default: %(default)s)",
+        metavar="N",
+        type=int,
+        default=8,
+        dest="concurrency",
+    )
+    parser.add_argument(
+        "--no-summary",
+        action="store_false",
+        help="skip webhdfs content summary, directory size and usage are 0",
+        dest="summary",
+    )
+    fsimage = parser.add_argument_group("fsimage")
+    fsimage.add_argument(
+        "--fsimage",
+        action="store",
+        help="read an `hdfs oiv` Delimited or XML output instead of the cluster",
+        metavar="FILE",
+        default=None,
+        dest="fsimage",
+    )
+    fsimage.add_argument(
+        "--delimiter",
+        action="store",
+        help="delimiter of the Delimited output (default: tab)",
+        metavar="CHAR",
+        default="\t",
+        dest="delimiter",
+    )
+    fsimage.add_argument(
+        "-j",
+        "--jobs",
+        action="store",
+        help="number of parser processes (default: %(default)s)",
+        metavar="N",
+        type=int,
+        default=os.cpu_count() or 1,
+        dest="jobs",
+    )
     auth = parser.add_argument_group("authentication")
     auth.add_argument(
         "-c",
@@ -1,24 +1,37 @@
-__version__ = "r2025.10.01-0"
+__version__ = "r2026.10.19-1"
 
 
 import csv
 import logging
+import sqlite3
 import sys
 from argparse import ArgumentParser, RawTextHelpFormatter
+from contextlib import ExitStack, contextmanager
 from enum import Enum
 from io import TextIOWrapper
 from pathlib import Path
 from urllib.parse import urlparse
 
 from cdp_metric_collector.cm_lib import config
-from cdp_metric_collector.cm_lib.hdfs import HDFSClient
+from cdp_metric_collector.cm_lib.hdfs import HDFSClient, PathNotFoundError
+from cdp_metric_collector.cm_lib.hdfs.structs import QuotaUsageProperties
 from cdp_metric_collector.cm_lib.hive import HiveClient
-from cdp_metric_collector.cm_lib.utils import ARGSBase, setup_logging
+from cdp_metric_collector.cm_lib.utils import (
+    ABC,
+    ARGSBase,
+    ordered_map,
+    setup_logging,
+    unordered_map,
+    wrap_async,
+)
 
 TYPE_CHECKING = False
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
+    from cdp_metric_collector.cm_lib.hdfs.structs import ContentSummaryProperties
+    from cdp_metric_collector.cm_lib.hive.structs import HiveDatabase, HiveLocation
+
 logger = logging.getLogger(__name__)
 prog: str | None = None
 
@@ -26,6 +39,7 @@ prog: str | None = None
 class R(Enum):
     LANDING = 0
     SCHEMA = 1
+    TABLE = 2
 
 
 class Arguments(ARGSBase):
@@ -33,38 +47,156 @@ class Arguments(ARGSBase):
     mode: R
     hive_url: str | None
     output: Path | int
+    concurrency: int
+    cache: Path | None
+
+
+@contextmanager
+def open_cache(fp: "Path | str"):
+    with sqlite3.connect(fp) as conn:
+        cursor = conn.executescript(
+            "PRAGMA journal_mode = WAL; PRAGMA synchronous = NORMAL;"
+        )
+        cursor.execute("""CREATE TABLE IF NOT EXISTS location_usage (
+        location TEXT NOT NULL PRIMARY KEY,
+        mtime INTEGER NOT NULL,
+        count INTEGER NOT NULL,
+        quota INTEGER NOT NULL,
+        consumed INTEGER NOT NULL,
+        space_quota INTEGER NOT NULL) WITHOUT ROWID""")
+        try:
+            yield cursor
+        finally:
+            conn.commit()
+            cursor.execute("PRAGMA optimize")
+            cursor.close()
+
+
+class UsageCache(ABC):
+    """usage of locations keyed on their modification time, a location whose
+    mtime is unchanged since the previous run is answered with a file status
+    call instead of a content summary"""
+
+    cursor: sqlite3.Cursor | None
+    hits: int
+    misses: int
 
+    def __init__(self, cursor: sqlite3.Cursor | None = None) -> None:
+        self.cursor = cursor
+        self.hits = 0
+        self.misses = 0
 
-def fetch_schema(hive: HiveClient, hdfs: HDFSClient):
-    for db in hive.databases(expand=True):
+    async def usage(
+        self, hdfs: HDFSClient, path: str
+    ) -> "QuotaUsageProperties | ContentSummaryProperties":
+        if self.cursor is None:
+            return await hdfs.usage(path)
+        mtime = (await hdfs.status(path)).modificationTime
+        row = self.cursor.execute(
+            "SELECT count, quota, consumed, space_quota FROM location_usage "
+            "WHERE location = ? AND mtime = ?",
+            (path, mtime),
+        ).fetchone()
+        if row is not None:
+            self.hits += 1
+            return QuotaUsageProperties(*row)
+        self.misses += 1
+        usage = await hdfs.usage(path)
+        self.cursor.execute(
+            "INSERT OR REPLACE INTO location_usage VALUES (?,?,?,?,?,?)",
+            (
+                path,
+                mtime,
+                usage.fileAndDirectoryCount,
+                usage.quota,
+                usage.spaceConsumed,
+                usage.spaceQuota,
+            ),
+        )
+        return usage
+
+
+async def fetch_schema(hive: HiveClient, hdfs: HDFSClient, concurrency: int):
+    async def fetch(db: "HiveDatabase"):
         logger.debug("getting data for schema %s", db)
         db_loc = urlparse(db.location).path
-        content = hdfs.content(db_loc)
-        yield (
+        content = await hdfs.usage(db_loc)
+        return (
             db.name,
             db_loc,
-            str(content.fileCount + content.directoryCount),
+            str(content.fileAndDirectoryCount),
             content.spaceQuota_hr,
             content.spaceConsumed_hr,
             content.spaceConsumed_perc,
             "Foundation" if db.name in config.FOUNDATION_SCHEMA else "Sandbox",
         )
 
+    dbs = await wrap_async(hive.databases, expand=True)
+    async for row in ordered_map(fetch, dbs, concurrency):
+        yield row
+
 
-def fetch_landing(hdfs: HDFSClient):
-    for fp in hdfs.list(config.HDFS_LANDING_PATH):
+async def fetch_table(
+    hive: HiveClient,
+    hdfs: HDFSClient,
+    concurrency: int,
+    cache: UsageCache,
+):
+    """usage of every partition and unpartitioned table, yielded as soon as
+    it is fetched"""
+
+    async def fetch(loc: "HiveLocation"):
+        logger.debug("getting data for %s", loc.location)
+        loc_path = urlparse(loc.location).path
+        try:
+            content = await cache.usage(hdfs, loc_path)
+        except PathNotFoundError as e:
+            logger.warning(e.message)
+            return None
+        return (
+            loc.database,
+            loc.table,
+            loc.partition,
+            loc_path,
+            str(content.fileAndDirectoryCount),
+            content.spaceQuota_hr,
+            content.spaceConsumed_hr,
+            content.spaceConsumed_perc,
+            "Foundation" if loc.database in config.FOUNDATION_SCHEMA else "Sandbox",
+        )
+
+    locs = await wrap_async(hive.locations)
+    # partitioned tables are covered by their partitions
+    partitioned = {(x.database, x.table) for x in locs if x.partition}
+    locs = [
+        x
+        for x in locs
+        if x.location and (x.partition or (x.database, x.table) not in partitioned)
+    ]
+    logger.info("fetching usage of %s locations", len(locs))
+    async for row in unordered_map(fetch, locs, concurrency):
+        if row is not None:
+            yield row
+
+
+async def fetch_landing(hdfs: HDFSClient, concurrency: int):
+    async def fetch(fp: str):
         logger.debug("getting data for path %s", fp)
-        content = hdfs.content(fp)
-        yield (
+        content = await hdfs.usage(fp)
+        return (
             fp,
-            str(content.fileCount + content.directoryCount),
+            str(content.fileAndDirectoryCount),
             content.spaceQuota_hr,
             content.spaceConsumed_hr,
             content.spaceConsumed_perc,
         )
 
+    paths = await hdfs.list(config.HDFS_LANDING_PATH)
+    async for row in ordered_map(fetch, paths, concurrency):
+        yield row
+
 
-def main(_args: "Sequence[str] | None" = None):
+async def main(_args: "Sequence[str] | None" = None):
     args = parse_args(_args)
     setup_logging(("cdp_metric_collector",), debug=args.verbose)
     logger.debug("got args %s", args)
@@ -77,33 +209,73 @@ def main(_args: "Sequence[str] | None" = None):
         write_through=True,
     ) as f:
         fw = csv.writer(f)
-        hdfs = HDFSClient(";".join(config.HDFS_NAMENODE_HOST))
-        match args.mode:
-            case R.SCHEMA:
-                with HiveClient(args.hive_url or config.HIVE_URL) as hive:
+        async with HDFSClient(
+            config.HDFS_NAMENODE_HOST, max_connections=args.concurrency
+        ) as hdfs:
+            match args.mode:
+                case R.SCHEMA:
+                    with HiveClient(args.hive_url or config.HIVE_URL) as hive:
+                        fw.writerow(
+                            (
+                                "Database",
+                                "Location",
+                                "File Count",
+                                "Quota",
+                                "Usage",
+                                "Percentage",
+                                "Type",
+                            )
+                        )
+                        async for row in fetch_schema(hive, hdfs, args.concurrency):
+                            fw.writerow(row)
+                case R.TABLE:
+                    with (
+                        HiveClient(args.hive_url or config.HIVE_URL) as hive,
+                        ExitStack() as stack,
+                    ):
+                        cache = UsageCache(
+                            stack.enter_context(open_cache(args.cache))
+                            if args.cache
+                            else None
+                        )
+                        fw.writerow(
+                            (
+                                "Database",
+                                "Table",
+                                "Partition",
+                                "Location",
+                                "File Count",
+                                "Quota",
+                                "Usage",
+                                "Percentage",
+                                "Type",
+                            )
+                        )
+                        async for row in fetch_table(
+                            hive, hdfs, args.concurrency, cache
+                        ):
+                            fw.writerow(row)
+                    if args.cache:
+                        logger.info(
+                            "%s of %s locations unchanged since cached",
+                            cache.hits,
+                            cache.hits + cache.misses,
+                        )
+                case R.LANDING:
                     fw.writerow(
                         (
-                            "Database",
-                            "Location",
+                            "Path",
                             "File Count",
                             "Quota",
                             "Usage",
                             "Percentage",
-                            "Type",
                         )
                     )
-                    fw.writerows(fetch_schema(hive, hdfs))
-            case R.LANDING:
-                fw.writerow(
-                    (
-                        "Path",
-                        "File Count",
-                        "Quota",
-                        "Usage",
-                        "Percentage",
-                    )
-                )
-                fw.writerows(fetch_landing(hdfs))
+                    async for row in fetch_landing(hdfs, args.concurrency):
+                        fw.writerow(row)
+            logger.info(
+                "%s content summaries avoided by quota usage", hdfs.summaries_avoided
+            )
 
 
 def parse_args(args: "Sequence[str] | None" = None):
@@ -146,6 +318,54 @@ def parse_args(args: "Sequence[str] | None" = None):
         default=sys.stdout.fileno(),
         dest="output",
     )
+    schema.add_argument(
+        "--concurrency",
+        action="store",
+        help="number of paths fetched concurrently (default: %(default)s)",
+        metavar="N",
+        type=int,
+        default=8,
+        dest="concurrency",
+    )
+    table = subparser.add_parser(
+        "table", help="export hive table and partition utilization"
+    )
+    table.set_defaults(mode=R.TABLE)
+    table.add_argument(
+        "-u",
+        action="store",
+        metavar="HIVE_URL",
+        default=None,
+        dest="hive_url",
+    )
+    table.add_argument(
+        "-o",
+        action="store",
+        help="dump result to FILE instead of stdout",
+        metavar="FILE",
+        type=Path,
+        default=sys.stdout.fileno(),
+        dest="output",
+    )
+    table.add_argument(
+        "--concurrency",
+        action="store",
+        help="number of paths fetched concurrently (default: %(default)s)",
+        metavar="N",
+        type=int,
+        default=8,
+        dest="concurrency",
+    )
+    table.add_argument(
+        "--cache",
+        action="store",
+        help="reuse usage of locations unmodified since the previous run,\n"
+        "kept in sqlite FILE",
+        metavar="FILE",
+        type=Path,
+        default=None,
+        dest="cache",
+    )
     landing = subparser.add_parser("landing", help="export hdfs landing utilization")
     landing.set_defaults(mode=R.LANDING)
     landing.add_argument(
@@ -157,4 +377,13 @@ def parse_args(args: "Sequence[str] | None" = None):
         default=sys.stdout.fileno(),
         dest="output",
     )
+    landing.add_argument(
+        "--concurrency",
+        action="store",
+        help="number of paths fetched concurrently (default: %(default)s)",
+        metavar="N",
+        type=int,
+        default=8,
+        dest="concurrency",
+    )
     return parser.parse_args(args, Arguments())
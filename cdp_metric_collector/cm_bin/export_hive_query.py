@@ -1,4 +1,4 @@
-__version__ = "r2025.10.14-0"
+__version__ = "r2026.10.19-7"
 
 
 import argparse
@@ -6,27 +6,42 @@ import csv
 import logging
 import sqlite3
 import sys
-from asyncio.tasks import gather
-from contextlib import contextmanager
+from asyncio.locks import Semaphore
+from asyncio.queues import Queue
+from asyncio.taskgroups import TaskGroup
+from asyncio.tasks import FIRST_COMPLETED, Task, create_task, wait, wait_for
+from contextlib import ExitStack, contextmanager
 from datetime import datetime
 from enum import Enum
+from functools import partial
+from hashlib import blake2b
 from io import TextIOWrapper
+from pathlib import Path
 
 from cdp_metric_collector.cm_lib import config
-from cdp_metric_collector.cm_lib.qp import DagInfoData, HUEQPClient, QueryInfo
+from cdp_metric_collector.cm_lib.errors import HTTPNotOK
+from cdp_metric_collector.cm_lib.qp import (
+    DagInfoData,
+    HUEQPClient,
+    QueryDetailCache,
+    QueryInfo,
+)
+from cdp_metric_collector.cm_lib.qp.cache import TERMINAL_STATUSES
+from cdp_metric_collector.cm_lib.qp.structs import QueryExtendedInfo
 from cdp_metric_collector.cm_lib.utils import (
+    ABC,
     ARGSBase,
     encode_json_str,
     pretty_size,
     setup_logging,
     strfdelta,
+    wrap_async,
 )
 from cdp_metric_collector.cm_lib.yarn import YARNRMClient
 
 TYPE_CHECKING = False
 if TYPE_CHECKING:
-    from collections.abc import Awaitable, Sequence
-    from pathlib import Path
+    from collections.abc import Awaitable, Callable, Collection, Sequence
     from typing import Any
 
 logger = logging.getLogger(__name__)
@@ -38,26 +53,30 @@ class CMD(Enum):
     HISTORY = 1
 
 
+# stored for refreshed queries the server no longer knows, terminal so
+# they are not refreshed again
+NOT_FOUND = "NOT_FOUND"
+
+
 class Arguments(ARGSBase):
     parser: argparse.ArgumentParser
     command: CMD
     verbose: bool
     output: str | None
-    start_time: datetime
+    start_time: datetime | None
     end_time: datetime
     all_history: bool
     query_id: str
     sql_output: bool
+    concurrency: int
+    incremental: bool
+    compact: bool
+    zstd: bool
+    cache: Path | None
+    cache_size: int
 
 
-@contextmanager
-def open_db(fp: "Path | str"):
-    with sqlite3.connect(fp, check_same_thread=False) as conn:
-        cursor = conn.executescript(
-            "PRAGMA journal_mode = WAL; PRAGMA synchronous = NORMAL;"
-        )
-        cursor.executescript("""
-        CREATE TABLE IF NOT EXISTS queries (
+QUERIES_COLUMNS = """
             query_id TEXT NOT NULL,
             application_id TEXT,
             start_time datetime NOT NULL,
@@ -65,39 +84,252 @@ def open_db(fp: "Path | str"):
             `user` TEXT NOT NULL,
             queue TEXT,
             status TEXT NOT NULL,
-            config TEXT,
-            `query` TEXT,
+            {config},
+            {query},
             data_read INTEGER,
             data_written INTEGER,
             tables_read TEXT,
             tables_written TEXT,
             cbo_enabled TEXT NOT NULL,
-            CONSTRAINT queries_pk PRIMARY KEY (query_id)
-        );
-        CREATE INDEX IF NOT EXISTS queries_application_id_IDX ON queries (application_id);
-        CREATE INDEX IF NOT EXISTS queries_start_time_IDX ON queries (start_time);
-        CREATE INDEX IF NOT EXISTS queries_end_time_IDX ON queries (end_time);
-        CREATE INDEX IF NOT EXISTS queries_user_IDX ON queries (`user`);
-        CREATE INDEX IF NOT EXISTS queries_queue_IDX ON queries (queue);
-        CREATE INDEX IF NOT EXISTS queries_status_IDX ON queries (status);
-        """)
+            CONSTRAINT {table}_pk PRIMARY KEY (query_id)
+"""
+QUERIES_INDEXES = """
+        CREATE INDEX IF NOT EXISTS {table}_application_id_IDX ON {table} (application_id);
+        CREATE INDEX IF NOT EXISTS {table}_start_time_IDX ON {table} (start_time);
+        CREATE INDEX IF NOT EXISTS {table}_end_time_IDX ON {table} (end_time);
+        CREATE INDEX IF NOT EXISTS {table}_user_IDX ON {table} (`user`);
+        CREATE INDEX IF NOT EXISTS {table}_queue_IDX ON {table} (queue);
+        CREATE INDEX IF NOT EXISTS {table}_status_IDX ON {table} (status);
+"""
+
+PLAIN_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS queries ("
+    + QUERIES_COLUMNS.format(
+        config="config TEXT", query="`query` TEXT", table="queries"
+    )
+    + ");"
+    + QUERIES_INDEXES.format(table="queries")
+)
+COMPACT_SCHEMA = (
+    """
+        CREATE TABLE IF NOT EXISTS query_text (
+            hash BLOB NOT NULL PRIMARY KEY,
+            body {body} NOT NULL
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS query_config (
+            hash BLOB NOT NULL PRIMARY KEY,
+            body {body} NOT NULL
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS query_history ("""
+    + QUERIES_COLUMNS.format(
+        config="config_hash BLOB", query="query_hash BLOB", table="query_history"
+    )
+    + ");"
+    + QUERIES_INDEXES.format(table="query_history")
+    + """
+        CREATE VIEW IF NOT EXISTS queries AS SELECT
+            h.query_id,
+            h.application_id,
+            h.start_time,
+            h.end_time,
+            h.`user`,
+            h.queue,
+            h.status,
+            {config} AS config,
+            {query} AS `query`,
+            h.data_read,
+            h.data_written,
+            h.tables_read,
+            h.tables_written,
+            h.cbo_enabled
+        FROM query_history h
+        LEFT JOIN query_config c ON c.hash = h.config_hash
+        LEFT JOIN query_text t ON t.hash = h.query_hash;
+"""
+)
+
+
+def compact_schema(zstd: bool = False):
+    if zstd:
+        return COMPACT_SCHEMA.format(
+            body="BLOB",
+            config="zstd_decompress(c.body)",
+            query="zstd_decompress(t.body)",
+        )
+    return COMPACT_SCHEMA.format(body="TEXT", config="c.body", query="t.body")
+
+
+class ContentStore(ABC):
+    """query text and config stored once per content in side tables keyed
+    by blake2b hash, as text or zstd compressed. query_history keeps the
+    hashes and the queries view joins them back into the plain layout. the
+    view of zstd bodies needs the zstd_decompress function, which only
+    connections opened by open_db have"""
+
+    compressor: "Any"
+    known: dict[str, set[bytes]]
+
+    def __init__(self, conn: sqlite3.Connection, zstd: bool = False) -> None:
+        self.compressor = None
+        self.known = {"query_text": set(), "query_config": set()}
+        if not zstd:
+            return
+        try:
+            import zstandard
+        except ImportError as e:
+            err = (
+                "zstd compressed sqlite output requires zstandard, "
+                "install cdp-metric-collector[compression]"
+            )
+            raise RuntimeError(err) from e
+        self.compressor = zstandard.ZstdCompressor(level=9)
+        decompressor = zstandard.ZstdDecompressor()
+        conn.create_function(
+            "zstd_decompress",
+            1,
+            lambda x: None if x is None else decompressor.decompress(x).decode(),
+            deterministic=True,
+        )
+
+    def ref(self, cursor: sqlite3.Cursor, table: str, text: str | None):
+        if text is None:
+            return None
+        data = text.encode()
+        key = blake2b(data, digest_size=16).digest()
+        if key not in self.known[table]:
+            cursor.execute(
+                f"INSERT OR IGNORE INTO {table} VALUES (?, ?)",
+                (
+                    key,
+                    text if self.compressor is None else self.compressor.compress(data),
+                ),
+            )
+            self.known[table].add(key)
+        return key
+
+    def insert(self, cursor: sqlite3.Cursor, rows: "Sequence[tuple[Any, ...]]"):
+        cursor.executemany(
+            "insert or replace into query_history values"
+            "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    *row[:7],
+                    self.ref(cursor, "query_config", row[7]),
+                    self.ref(cursor, "query_text", row[8]),
+                    *row[9:],
+                )
+                for row in rows
+            ],
+        )
+
+
+@contextmanager
+def open_db(fp: "Path | str", compact: bool = False, zstd: bool = False):
+    """yields the connection, cursor and the content store of a compact
+    database, which keeps its layout once created"""
+    with sqlite3.connect(fp, check_same_thread=False) as conn:
+        cursor = conn.executescript(
+            "PRAGMA journal_mode = WAL; PRAGMA synchronous = NORMAL;"
+        )
+        compact = compact or zstd
+        match cursor.execute(
+            "SELECT type, sql FROM sqlite_master WHERE name = 'queries'"
+        ).fetchone():
+            case ("table", _) if compact:
+                err = f"{fp} already uses the plain layout"
+                raise ValueError(err)
+            case ("view", sql) if zstd and "zstd_decompress" not in sql:
+                err = f"{fp} already uses the uncompressed compact layout"
+                raise ValueError(err)
+            case ("view", sql):
+                compact = True
+                zstd = "zstd_decompress" in sql
+        store = None
+        if compact:
+            store = ContentStore(conn, zstd)
+        cursor.executescript(compact_schema(zstd) if compact else PLAIN_SCHEMA)
         try:
-            yield conn, cursor
+            yield conn, cursor, store
         finally:
             conn.commit()
             cursor.execute("PRAGMA optimize")
             cursor.close()
 
 
+def sync_state(cursor: sqlite3.Cursor, start_time: datetime | None):
+    """start of an incremental sync, the stored high-water mark unless
+    start_time is set, with query ids stored as finished since then and ids
+    stored in a non-terminal status"""
+    if start_time is None:
+        (hwm,) = cursor.execute("SELECT max(start_time) FROM queries").fetchone()
+        start_time = datetime.fromisoformat(hwm) if hwm else today()
+    terminal = (*TERMINAL_STATUSES, NOT_FOUND)
+    marks = ",".join("?" * len(terminal))
+    finished = {
+        x
+        for (x,) in cursor.execute(
+            f"SELECT query_id FROM queries WHERE status IN ({marks}) "
+            "AND start_time >= ?",
+            (*terminal, start_time.isoformat(" ", "milliseconds")),
+        )
+    }
+    unfinished = [
+        x
+        for (x,) in cursor.execute(
+            f"SELECT query_id FROM queries WHERE status NOT IN ({marks})",
+            terminal,
+        )
+    ]
+    logger.info(
+        "syncing from %s, skipping %s finished and refreshing %s unfinished queries",
+        start_time.isoformat(" "),
+        len(finished),
+        len(unfinished),
+    )
+    return start_time, finished, unfinished
+
+
+def mark_not_found(
+    cursor: sqlite3.Cursor, store: "ContentStore | None", query_ids: "Collection[str]"
+):
+    """set the NOT_FOUND status on stored queries"""
+    cursor.executemany(
+        "UPDATE {} SET status = ? WHERE query_id = ?".format(
+            "queries" if store is None else "query_history"
+        ),
+        [(NOT_FOUND, x) for x in query_ids],
+    )
+
+
+def today():
+    return datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+async def query_detail(
+    client: HUEQPClient,
+    query_id: str,
+    cache: QueryDetailCache | None = None,
+):
+    if cache is None:
+        return await client.query_detail(query_id)
+    if (info := await cache.get(query_id)) is not None:
+        return info
+    body = await client.query_detail_raw(query_id)
+    info = await wrap_async(QueryExtendedInfo.decode_json, body)
+    cache.put(query_id, body, info.query.status)
+    return info
+
+
 async def get_row_csv(
     client: HUEQPClient,
     q: QueryInfo,
     dag_info: DagInfoData | None,
     expand: bool = True,
+    cache: QueryDetailCache | None = None,
 ) -> tuple["Any", ...]:
     if dag_info:
         if expand:
-            qe = (await client.query_detail(q.queryId)).query
+            qe = (await query_detail(client, q.queryId, cache)).query
             start, end, elapsed = qe.duration()
             return (
                 q.queryId,
@@ -145,7 +377,7 @@ async def get_row_csv(
             )
     else:
         if expand:
-            qe = (await client.query_detail(q.queryId)).query
+            qe = (await query_detail(client, q.queryId, cache)).query
             start, end, elapsed = qe.duration()
             return (
                 q.queryId,
@@ -197,12 +429,17 @@ async def get_row_sql(
     client: HUEQPClient,
     q: QueryInfo,
     dag_info: DagInfoData | None,
+    cache: QueryDetailCache | None = None,
 ) -> tuple["Any", ...]:
-    qe = (await client.query_detail(q.queryId)).query
+    qe = (await query_detail(client, q.queryId, cache)).query
     start, end, _ = qe.duration()
     return (
         q.queryId,
-        dag_info.applicationId if dag_info else None,
+        (
+            dag_info.applicationId
+            if dag_info
+            else next((x.dagInfo.applicationId for x in qe.dags), None)
+        ),
         start.isoformat(" ", "milliseconds"),
         end.isoformat(" ", "milliseconds") if end else None,
         qe.requestUser,
@@ -218,38 +455,165 @@ async def get_row_sql(
     )
 
 
+async def search_queries(
+    client: HUEQPClient,
+    start: int,
+    end: int,
+    concurrency: int = 4,
+    page_size: int = 100,
+    min_slice: int = 1000,
+):
+    """search [start, end] in milliseconds as concurrent time slices instead
+    of deep offset pages. a slice returning a full page is split in half
+    until it fits a page, slices narrower than min_slice are paged by
+    offset. adjacent slices share their boundary millisecond, so queries
+    starting on it are found whether the end bound is inclusive or not.
+    queries are yielded once per query id as slices complete"""
+    sem = Semaphore(concurrency)
+    seen: set[str] = set()
+
+    async def search(lo: int, hi: int, offset: int = 0):
+        async with sem:
+            sq = await client.search_query(lo, hi, limit=page_size, offset=offset)
+        logger.debug(
+            "fetched %s queries between %s and %s from offset %s",
+            len(sq.queries),
+            lo,
+            hi,
+            offset,
+        )
+        return lo, hi, offset, sq.queries
+
+    step = max((end - start) // concurrency, min_slice)
+    tasks: set[Task[tuple[int, int, int, list[QueryInfo]]]] = {
+        create_task(search(lo, min(lo + step, end)))
+        for lo in range(start, max(end, start + 1), step)
+    }
+    try:
+        while tasks:
+            done, tasks = await wait(tasks, return_when=FIRST_COMPLETED)
+            for task in done:
+                lo, hi, offset, queries = task.result()
+                if len(queries) >= page_size:
+                    if offset == 0 and hi - lo >= min_slice:
+                        mid = lo + (hi - lo) // 2
+                        tasks.add(create_task(search(lo, mid)))
+                        tasks.add(create_task(search(mid, hi)))
+                    else:
+                        tasks.add(create_task(search(lo, hi, offset + len(queries))))
+                new = [x for x in queries if x.queryId not in seen]
+                seen.update(x.queryId for x in new)
+                if new:
+                    yield new
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
 async def export_data(
     client: HUEQPClient,
     start_time: datetime,
     end_time: datetime,
     all_history: bool,
     sql: bool,
+    concurrency: int = 8,
+    batch_size: int = 100,
+    flush_interval: float = 1.0,
+    skip: "Collection[str]" = (),
+    refresh: "Collection[str]" = (),
+    cache: QueryDetailCache | None = None,
+    not_found: set[str] | None = None,
 ):
+    """search pages are produced ahead into a bounded queue, query details
+    are fetched by concurrency workers and rows are yielded in batches of
+    batch_size, or whatever arrived once no row came for flush_interval
+    seconds, so at most concurrency detail requests are in flight.
+    queries in skip are not fetched, queries in refresh are fetched even
+    if the search does not return them, those the server answers with 404
+    are logged and added to not_found instead. details of finished queries
+    are read from and kept in cache if set"""
     stq = int(start_time.timestamp() * 1000)
     etq = int(end_time.timestamp() * 1000)
-    fetch_row = get_row_sql if sql else get_row_csv
-
-    async def fetch_data():
-        offset = 0
-        qlen = -1
-        while qlen != 0:
-            sq = await client.search_query(stq, etq, offset=max(0, offset + qlen))
-            qlen = len(sq.queries)
-            logger.debug("fetched %s queries", qlen)
-            offset = offset + qlen
-            yield sq.queries
-
-    tasks: list[Awaitable[tuple[Any, ...]]] = []
-    async for queries in fetch_data():
-        for q in queries:
+    fetch_row: Callable[..., Awaitable[tuple[Any, ...]]] = partial(
+        get_row_sql if sql else get_row_csv, cache=cache
+    )
+    pending: Queue[tuple[QueryInfo, DagInfoData | None, bool] | None] = Queue(
+        concurrency * 4
+    )
+    results: Queue[tuple[Any, ...] | None] = Queue(batch_size)
+
+    async def produce():
+        remaining = set(refresh)
+        async for queries in search_queries(client, stq, etq):
+            for q in queries:
+                if q.queryId in skip:
+                    continue
+                dag_info = next((x.dagInfo for x in q.dags), None)
+                if dag_info is not None or all_history or q.queryId in remaining:
+                    remaining.discard(q.queryId)
+                    await pending.put((q, dag_info, False))
+        for query_id in remaining:
+            await pending.put(
+                (
+                    QueryInfo(startTime=0, endTime=None, dags=[], queryId=query_id),
+                    None,
+                    True,
+                )
+            )
+        for _ in range(concurrency):
+            await pending.put(None)
+
+    async def fetch():
+        while (item := await pending.get()) is not None:
+            q, dag_info, refresh_only = item
+            try:
+                row = await fetch_row(client, q, dag_info)
+            except HTTPNotOK as e:
+                if not refresh_only or e.status != 404:
+                    raise
+                logger.warning("stored query %s no longer found", q.queryId)
+                if not_found is not None:
+                    not_found.add(q.queryId)
+                continue
+            await results.put(row)
+
+    async def run():
+        try:
+            async with TaskGroup() as tg:
+                tg.create_task(produce())
+                for _ in range(concurrency):
+                    tg.create_task(fetch())
+        except BaseException as e:
+            # wake up the writer, rows still queued are dropped
+            while not results.empty():
+                results.get_nowait()
+            results.put_nowait(None)
+            if isinstance(e, BaseExceptionGroup) and len(e.exceptions) == 1:
+                raise e.exceptions[0] from None
+            raise
+        await results.put(None)
+
+    runner = create_task(run())
+    try:
+        rows: list[tuple[Any, ...]] = []
+        while True:
             try:
-                dag_info = next(x.dagInfo for x in q.dags)
-                tasks.append(fetch_row(client, q, dag_info))
-            except StopIteration:
-                if all_history:
-                    tasks.append(fetch_row(client, q, None))
-        yield await gather(*tasks)
-        tasks.clear()
+                row = await wait_for(results.get(), flush_interval if rows else None)
+            except TimeoutError:
+                yield rows
+                rows = []
+                continue
+            if row is None:
+                break
+            rows.append(row)
+            if len(rows) >= batch_size:
+                yield rows
+                rows = []
+        if rows:
+            yield rows
+        await runner
+    finally:
+        runner.cancel()
 
 
 async def main(_args: "Sequence[str] | None" = None):
@@ -309,61 +673,95 @@ async def main(_args: "Sequence[str] | None" = None):
                     )
                 )
             case CMD.HISTORY:
-                if args.sql_output:
-                    if not args.output:
-                        args.parser.error("sql output must have '-o' set")
-                    with open_db(args.output) as (conn, cursor):
-                        async for rows in export_data(
-                            c,
-                            args.start_time,
-                            args.end_time,
-                            args.all_history,
-                            sql=True,
+                with ExitStack() as stack:
+                    cache = None
+                    if args.cache:
+                        cache = stack.enter_context(
+                            QueryDetailCache(args.cache, args.cache_size << 20)
+                        )
+                    if args.sql_output:
+                        if not args.output:
+                            args.parser.error("sql output must have '-o' set")
+                        with open_db(args.output, args.compact, args.zstd) as (
+                            conn,
+                            cursor,
+                            store,
                         ):
-                            cursor.executemany(
-                                "insert or replace into queries values"
-                                "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                                rows,
-                            )
-                            conn.commit()
+                            start_time = args.start_time or today()
+                            finished: set[str] = set()
+                            unfinished: list[str] = []
+                            not_found: set[str] = set()
+                            if args.incremental:
+                                start_time, finished, unfinished = sync_state(
+                                    cursor, args.start_time
+                                )
+                            async for rows in export_data(
+                                c,
+                                start_time,
+                                args.end_time,
+                                args.all_history,
+                                sql=True,
+                                concurrency=args.concurrency,
+                                skip=finished,
+                                refresh=unfinished,
+                                cache=cache,
+                                not_found=not_found,
+                            ):
+                                if store is None:
+                                    cursor.executemany(
+                                        "insert or replace into queries values"
+                                        "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                        rows,
+                                    )
+                                else:
+                                    store.insert(cursor, rows)
+                                conn.commit()
+                            mark_not_found(cursor, store, not_found)
 
-                else:
-                    csv.field_size_limit(sys.maxsize)
-                    with TextIOWrapper(
-                        open(args.output or sys.stdout.fileno(), "wb", 0),
-                        encoding="utf-8",
-                        newline="",
-                        write_through=True,
-                    ) as f:
-                        fw = csv.writer(f)
-                        fw.writerow(
-                            (
-                                "Query ID",
-                                "Application ID",
-                                "Start Time",
-                                "End Time",
-                                "User",
-                                "Queue",
-                                "Status",
-                                "Config",
-                                "Elapsed Time",
-                                "Query",
-                                "Query Length",
-                                "Data Read",
-                                "Data Written",
-                                "Tables Read",
-                                "Tables Written",
-                                "CBO Enabled",
+                    else:
+                        if args.incremental or args.compact or args.zstd:
+                            args.parser.error(
+                                "'--incremental', '--compact' and '--zstd' "
+                                "require '--sql'"
                             )
-                        )
-                        async for rows in export_data(
-                            c,
-                            args.start_time,
-                            args.end_time,
-                            args.all_history,
-                            sql=False,
-                        ):
-                            fw.writerows(rows)
+                        csv.field_size_limit(sys.maxsize)
+                        with TextIOWrapper(
+                            open(args.output or sys.stdout.fileno(), "wb", 0),
+                            encoding="utf-8",
+                            newline="",
+                            write_through=True,
+                        ) as f:
+                            fw = csv.writer(f)
+                            fw.writerow(
+                                (
+                                    "Query ID",
+                                    "Application ID",
+                                    "Start Time",
+                                    "End Time",
+                                    "User",
+                                    "Queue",
+                                    "Status",
+                                    "Config",
+                                    "Elapsed Time",
+                                    "Query",
+                                    "Query Length",
+                                    "Data Read",
+                                    "Data Written",
+                                    "Tables Read",
+                                    "Tables Written",
+                                    "CBO Enabled",
+                                )
+                            )
+                            async for rows in export_data(
+                                c,
+                                args.start_time or today(),
+                                args.end_time,
+                                args.all_history,
+                                sql=False,
+                                concurrency=args.concurrency,
+                                cache=cache,
+                            ):
+                                fw.writerows(rows)
 
 
 def parse_args(args: "Sequence[str] | None" = None):
@@ -389,15 +787,16 @@ def parse_args(args: "Sequence[str] | None" = None):
     )
     subparser = parser.add_subparsers(required=True, metavar="command")
     history = subparser.add_parser("history", help="export hive query history")
-    history.set_defaults(command=CMD.HISTORY)
+    history.set_defaults(command=CMD.HISTORY, parser=history)
     history.add_argument(
         "-s",
         "--start-time",
         action="store",
-        help="export data from TIME (ISO format, today if unset)",
+        help="export data from TIME (ISO format, today or the stored high-water mark\n"
+        "with '--incremental' if unset)",
         metavar="TIME",
         type=datetime.fromisoformat,
-        default=datetime.now().replace(hour=0, minute=0, second=0, microsecond=0),
+        default=None,
         dest="start_time",
     )
     history.add_argument(
@@ -422,6 +821,57 @@ def parse_args(args: "Sequence[str] | None" = None):
         help="set output format to sqlite instead of csv",
         dest="sql_output",
     )
+    history.add_argument(
+        "--incremental",
+        action="store_true",
+        help="with '--sql', only fetch queries not stored as finished yet and\n"
+        "refresh stored queries that were still running",
+        dest="incremental",
+    )
+    history.add_argument(
+        "--compact",
+        action="store_true",
+        help="with '--sql', store each distinct query text and config once,\n"
+        "behind a queries view of the usual columns",
+        dest="compact",
+    )
+    history.add_argument(
+        "--zstd",
+        action="store_true",
+        help="'--compact' with zstd compressed query text and config, the\n"
+        "queries view then needs a zstd_decompress sql function, which other\n"
+        "sqlite clients do not have",
+        dest="zstd",
+    )
+    history.add_argument(
+        "--cache",
+        action="store",
+        help="keep details of finished queries in sqlite FILE and read them\n"
+        "from there instead of hue query processor on later runs",
+        metavar="FILE",
+        type=Path,
+        default=None,
+        dest="cache",
+    )
+    history.add_argument(
+        "--cache-size",
+        action="store",
+        help="evict least recently used cached details above MiB\n"
+        "(default: %(default)s)",
+        metavar="MiB",
+        type=int,
+        default=1024,
+        dest="cache_size",
+    )
+    history.add_argument(
+        "--concurrency",
+        action="store",
+        help="number of query details fetched concurrently (default: %(default)s)",
+        metavar="N",
+        type=int,
+        default=8,
+        dest="concurrency",
+    )
     history.add_argument(
         "-o",
         action="store",
@@ -1,4 +1,4 @@
-__version__ = "r2025.11.10-1"
+__version__ = "r2026.10.19-0"
 
 
 import argparse
@@ -69,7 +69,7 @@ async def process_app(
         env = await get_env(attempt.attemptId)
         c = 0
         if with_sql:
-            async for sql in hdfs.spark_sql(app.id):
+            async for sql in hdfs.spark_sql(app.id, attempt.attemptId):
                 c += 1
                 result.append(
                     (
@@ -139,18 +139,18 @@ async def main(_args: "Sequence[str] | None" = None):
                 "Query Plan",
             )
         )
-        hdfs = HDFSClient(";".join(config.HDFS_NAMENODE_HOST))
-        for host in config.SPARK_HISTORY_HOST:
-            async with SparkHistoryClient(host) as spark:
-                apps = await spark.applications(
-                    args.status,
-                    args.min_date,
-                    args.max_date,
-                    limit=args.limit,
-                )
-                logger.debug("fetched %s applications", len(apps))
-                for rows in as_completed([processor(x) for x in apps]):
-                    fw.writerows(await rows)
+        async with HDFSClient(config.HDFS_NAMENODE_HOST) as hdfs:
+            for host in config.SPARK_HISTORY_HOST:
+                async with SparkHistoryClient(host) as spark:
+                    apps = await spark.applications(
+                        args.status,
+                        args.min_date,
+                        args.max_date,
+                        limit=args.limit,
+                    )
+                    logger.debug("fetched %s applications", len(apps))
+                    for rows in as_completed([processor(x) for x in apps]):
+                        fw.writerows(await rows)
 
 
 def parse_args(args: "Sequence[str] | None" = None):
@@ -1,4 +1,4 @@
-__version__ = "r2025.12.22-3"
+__version__ = "r2026.10.19-0"
 
 
 import csv
@@ -22,6 +22,7 @@ from cdp_metric_collector.cm_lib.cm import (
     MetricContentType,
     MetricRollupType,
     TimeData,
+    YarnQMSnapshot,
     YQMCLient,
 )
 from cdp_metric_collector.cm_lib.utils import (
@@ -98,6 +99,10 @@ async def fetch_queues(auth: CMAuth):
 
 def fetch_queues_from_file(fp: Path | str):
     """{pool_name: (core, mem, max_apps)}"""
+    with open(fp, "rb") as f:
+        is_csv = f.read(5) == b"Name|"
+    if not is_csv:
+        return YarnQMSnapshot.decode_msgpack(Path(fp).read_bytes()).resources()
     data: dict[str, tuple[int, int, int]] = {}
     with open(fp, "r", newline="", encoding="utf-8") as f:
         fr = csv.reader(f, delimiter="|")
@@ -286,7 +291,7 @@ def parse_args(args: "Sequence[str] | None" = None):
     parser.add_argument(
         "--yqm-file",
         action="store",
-        help="load yarn queues from FILE",
+        help="load yarn queues from FILE (CSV or msgpack snapshot)",
         metavar="FILE",
         type=Path,
         default=None,
@@ -1,4 +1,4 @@
-__version__ = "r2025.10.01-0"
+__version__ = "r2026.10.19-0"
 
 
 import logging
@@ -28,6 +28,7 @@ class Arguments(ARGSWithAuthBase):
     json_file: Path | None
     output: Path | int
     as_json: bool
+    snapshot: Path | None
 
 
 async def main(_args: "Sequence[str] | None" = None):
@@ -43,10 +44,15 @@ async def main(_args: "Sequence[str] | None" = None):
             args.parser.error("No auth mechanism is passed")
         async with YQMCLient(config.CM_HOST, auth) as c:
             if args.as_json:
+                raw = await c.get_config(raw=True)
                 with open(args.output, "wb") as fo:
-                    fo.write(await c.get_config(raw=True))
+                    fo.write(raw)
+                if args.snapshot:
+                    YarnQMResponse.decode_json(raw).serialize_to_msgpack(args.snapshot)
                 return
             data = await c.get_config()
+    if args.snapshot:
+        data.serialize_to_msgpack(args.snapshot)
     data.serialize_to_csv(args.output)
 
 
@@ -96,6 +102,16 @@ def parse_args(args: "Sequence[str] | None" = None):
         help="format result as JSON instead of CSV",
         dest="as_json",
     )
+    parser.add_argument(
+        "--snapshot",
+        action="store",
+        help="also write a binary (msgpack) queue snapshot to FILE\n"
+        "usable as --yqm-file for `export yarn pool-stats` and `auto yqm-config`",
+        metavar="FILE",
+        type=Path,
+        default=None,
+        dest="snapshot",
+    )
     auth = parser.add_argument_group("authentication")
     auth.add_argument(
         "-c",
@@ -20,6 +20,7 @@ __all__ = (
     "YQMOperator",
     "YQMQueueACL",
     "YarnQMResponse",
+    "YarnQMSnapshot",
 )
 
 
@@ -43,6 +44,7 @@ from .structs import (
     TimeData,
     TimeSeriesPayload,
     YarnQMResponse,
+    YarnQMSnapshot,
     YQMConfigPayload,
     YQMConfigProp,
 )
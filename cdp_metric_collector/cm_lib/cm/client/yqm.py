@@ -67,7 +67,7 @@ class YQMCLient(CMAPIClientBase):
         )
         if acls == last_state:
             logger.info("no changes to update from last state")
-            return
+            return False
         logger.info("setting acls %r to pool %s", acls, pool)
         payload = YQMConfigPayload(
             [
@@ -86,6 +86,7 @@ class YQMCLient(CMAPIClientBase):
             ssl=False,
         ):
             pass
+        return True
 
 
 def parse_acl(last: list[str], acls: list[YQMQueueACL]):
@@ -10,9 +10,10 @@ __all__ = (
     "YQMConfigPayload",
     "YQMConfigProp",
     "YarnQMResponse",
+    "YarnQMSnapshot",
 )
 
 
 from .cm import APICommand, AuthRoles, Commands, FileBrowserResults, HealthIssues, Hosts
 from .timeseries import TimeData, TimeSeriesPayload
-from .yqm import YarnQMResponse, YQMConfigPayload, YQMConfigProp
+from .yqm import YarnQMResponse, YarnQMSnapshot, YQMConfigPayload, YQMConfigProp
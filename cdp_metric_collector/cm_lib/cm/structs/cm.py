@@ -153,6 +153,10 @@ class HealthIssues(Decodable):
                 entity.clusterName,
             )
 
+    def indexed(self):
+        """{(testIdentifier, entityId): row}"""
+        return {(row[0], row[3]): row for row in self}
+
 
 class APICommand(Decodable):
     id: int
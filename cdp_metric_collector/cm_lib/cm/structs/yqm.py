@@ -1,7 +1,8 @@
 import csv
+from datetime import datetime
 from io import TextIOWrapper
 
-from msgspec import Struct, field
+from msgspec import Struct, field, msgpack
 
 from cdp_metric_collector.cm_lib.structs import Decodable
 
@@ -25,11 +26,61 @@ class YQCapacityResource(Struct):
     vcores: str
 
 
+def _to_float(value: str):
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
 class YQCapacity(Struct):
     percentage: str
     resource: YQCapacityResource
 
 
+class QueueResource(Struct, array_like=True):
+    vcores: int
+    memory: int
+
+    @classmethod
+    def from_capacity(cls, resource: YQCapacityResource):
+        return cls(int(resource.vcores, 10), int(resource.memory, 10))
+
+
+class QueueSnapshot(Struct, array_like=True):
+    queuePath: str
+    capacity: float | None
+    maxCapacity: float | None
+    effectiveMinResource: QueueResource
+    effectiveMaxResource: QueueResource
+    maxAMResourceLimit: float | None
+    state: str
+    userLimit: float | None
+    userLimitFactor: float | None
+    maxApplications: int
+    aclAdmin: str
+    aclSubmit: str
+
+
+class YarnQMSnapshot(Decodable):
+    """typed and indexed by queuePath, written by `export yarn queues --snapshot`"""
+
+    createdAt: datetime
+    queues: dict[str, QueueSnapshot]
+
+    def resources(self, min_level: int = 2):
+        """{pool_name: (core, mem, max_apps)}"""
+        return {
+            k: (
+                v.effectiveMaxResource.vcores,
+                v.effectiveMaxResource.memory,
+                v.maxApplications,
+            )
+            for k, v in self.queues.items()
+            if k.count(".") >= min_level
+        }
+
+
 class YQProperties(Struct):
     aclAdmin: str = field(name="queueAcls.ADMINISTER_QUEUE")
     aclSubmit: str = field(name="queueAcls.SUBMIT_APP")
@@ -84,10 +135,40 @@ class YarnQueue(Struct):
         yield submit_acl[0]
         yield submit_acl[2]
 
+    def to_snapshot(self):
+        return QueueSnapshot(
+            self.queuePath,
+            _to_float(self.capacity.percentage),
+            _to_float(self.maxCapacity.percentage),
+            QueueResource.from_capacity(self.effectiveMinResource),
+            QueueResource.from_capacity(self.effectiveMaxResource),
+            _to_float(self.properties.configuredMaxAMResourceLimit),
+            self.state,
+            _to_float(self.properties.userLimit),
+            _to_float(self.properties.userLimitFactor),
+            int(self.properties.maxApplications or "0", 10),
+            self.properties.aclAdmin,
+            self.properties.aclSubmit,
+        )
+
 
 class YarnQMResponse(Decodable):
     queues: list[YarnQueue]
 
+    def index(self):
+        """{queuePath: queue}"""
+        return {x.queuePath: x for x in self.queues}
+
+    def to_snapshot(self):
+        return YarnQMSnapshot(
+            datetime.now(),
+            {x.queuePath: x.to_snapshot() for x in self.queues},
+        )
+
+    def serialize_to_msgpack(self, output: "Path | int"):
+        with open(output, "wb") as fo:
+            fo.write(msgpack.encode(self.to_snapshot()))
+
     def serialize_to_csv(self, output: "Path | int"):
         with TextIOWrapper(
             open(output, "wb", 0),
@@ -35,6 +35,7 @@ HDFS_REBALANCE_STATUS: str
 
 # HIVE
 FOUNDATION_SCHEMA: list[str]
+HIVE_POOL_SIZE: int = 4
 HIVE_URL: str
 
 # HUE
@@ -25,6 +25,7 @@ class HDFSConfig(Struct):
 
 class HiveConfig(Struct):
     foundation_schema: Annotated[list[str] | UnsetType, "FOUNDATION_SCHEMA"] = UNSET
+    pool_size: Annotated[int | UnsetType, "HIVE_POOL_SIZE"] = UNSET
     url: Annotated[str | UnsetType, "HIVE_URL"] = UNSET
 
 
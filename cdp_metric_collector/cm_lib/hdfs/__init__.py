@@ -6,12 +6,20 @@ __all__ = (
     "FileStatuses",
     "FileType",
     "HDFSClient",
+    "HDFSError",
+    "JMXSnapshot",
     "NameNodeClient",
+    "PathNotFoundError",
+    "QuotaUsage",
     "SparkListenerSQLExecutionStart",
+    "StandbyError",
+    "WalkEntry",
+    "walk",
 )
 
 
-from .client import HDFSClient, NameNodeClient
+from .client import HDFSClient, JMXSnapshot, NameNodeClient
+from .errors import HDFSError, PathNotFoundError, StandbyError
 from .structs import (
     ContentSummary,
     DFSHealth,
@@ -19,5 +27,7 @@ from .structs import (
     FileStatuses,
     FileStatusProperties,
     FileType,
+    QuotaUsage,
     SparkListenerSQLExecutionStart,
 )
+from .walker import WalkEntry, walk
@@ -1,8 +1,9 @@
 __all__ = (
     "HDFSClient",
+    "JMXSnapshot",
     "NameNodeClient",
 )
 
 
 from .base import HDFSClient
-from .namenode import NameNodeClient
+from .namenode import JMXSnapshot, NameNodeClient
@@ -1,125 +1,314 @@
 import builtins
 import logging
-import warnings
-from io import BytesIO
-from typing import Any, Literal, cast, overload
+from contextlib import asynccontextmanager
+from typing import Any, Literal, overload
+from urllib.parse import quote
 from xml.etree import ElementTree as ET
 
+from httpx import Limits, TransportError
 from msgspec import ValidationError
-from requests import Session
-from urllib3.exceptions import InsecureRequestWarning
 
+from cdp_metric_collector.cm_lib.hdfs.codecs import (
+    CODECS,
+    PlainDecoder,
+    StreamDecoder,
+    get_decoder,
+)
+from cdp_metric_collector.cm_lib.hdfs.errors import (
+    HDFSError,
+    PathNotFoundError,
+    StandbyError,
+)
 from cdp_metric_collector.cm_lib.hdfs.structs import (
     ContentSummary,
+    DirectoryListing,
     FileStatus,
     FileStatuses,
     FileStatusProperties,
     FileType,
+    QuotaUsage,
     SparkListenerSQLExecutionStart,
 )
-from cdp_metric_collector.cm_lib.utils import ABC, wrap_async
-from hdfs.util import HdfsError
+from cdp_metric_collector.cm_lib.kerberos import KerberosClientBase
+from cdp_metric_collector.cm_lib.utils import wrap_async
 
 TYPE_CHECKING = False
 if TYPE_CHECKING:
-    from urllib3 import HTTPResponse
-
-with warnings.catch_warnings():
-    warnings.simplefilter("ignore")
-    from hdfs.ext.kerberos import KerberosClient
+    from collections.abc import Iterable
 
 logger = logging.getLogger(__name__)
 
+SQL_EXECUTION_START = b"SparkListenerSQLExecutionStart"
+SPARK_EVENT_LOG_DIR = "/user/spark/applicationHistory"
+SPARK_EVENT_LOG_FORMATS = [
+    "eventlog_v2_{}",
+    *(
+        f"{{}}{codec}{suffix}"
+        for codec in ("", *(f".{x}" for x in CODECS))
+        for suffix in ("", ".inprogress")
+    ),
+]
+
+
+def namenodes_from_site(fp: str = "/etc/hadoop/conf/hdfs-site.xml"):
+    def find_name(root: "ET.ElementTree[Any]", path: str, name: str):
+        for i in root.iterfind(path):
+            match i.find("name"), i.find("value"):
+                case ET.Element() as iname, ET.Element() as value:
+                    if iname.text == name:
+                        return value.text or ""
+        raise KeyError
 
-warnings.filterwarnings("ignore", category=InsecureRequestWarning)
+    hdfs_site = ET.parse(fp)
+    ns = find_name(hdfs_site, "property", "dfs.nameservices")
+    nn = find_name(hdfs_site, "property", f"dfs.ha.namenodes.{ns}")
+    return [
+        "https://"
+        + find_name(
+            hdfs_site,
+            "property",
+            f"dfs.namenode.https-address.{ns}.{n}",
+        )
+        for n in nn.split(",")
+    ]
 
 
-class HDFSClient(ABC):
-    hdfs: KerberosClient
+def decode_sql_events(lines: "Iterable[bytes]"):
+    result: list[SparkListenerSQLExecutionStart] = []
+    for line in lines:
+        try:
+            result.append(SparkListenerSQLExecutionStart.decode_json(line))
+        except ValidationError:
+            pass
+    return result
+
+
+def event_log_index(path: str):
+    """N of rolling event log segment events_N_appId"""
+    try:
+        return int(path.rpartition("/")[2].split("_", 2)[1], 10)
+    except (IndexError, ValueError):
+        return -1
 
-    def __init__(self, url: str | None = None):
-        def find_name(root: "ET.ElementTree[Any]", path: str, name: str):
-            for i in root.iterfind(path):
-                match i.find("name"), i.find("value"):
-                    case ET.Element() as iname, ET.Element() as value:
-                        if iname.text == name:
-                            return value.text or ""
-            raise KeyError
 
-        if url is None:
+class HDFSClient(KerberosClientBase):
+    nn_hosts: list[str]
+    event_log_formats: list[str]
+    quota_usage_supported: bool
+    summaries_avoided: int
+
+    def __init__(self, urls: list[str] | None = None, max_connections: int = 16):
+        if urls is None:
             logger.debug("no hdfs url is passed, trying to get url from hdfs-site.xml")
-            hdfs_site = ET.parse("/etc/hadoop/conf/hdfs-site.xml")
-            ns = find_name(hdfs_site, "property", "dfs.nameservices")
-            nn = find_name(hdfs_site, "property", f"dfs.ha.namenodes.{ns}")
-            url = ";".join(
-                "https://"
-                + find_name(
-                    hdfs_site,
-                    "property",
-                    f"dfs.namenode.https-address.{ns}.{n}",
-                )
-                for n in nn.split(",")
+            urls = namenodes_from_site()
+        super().__init__(
+            "",
+            limits=Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=None,
+        )
+        self.nn_hosts = list(urls)
+        self.event_log_formats = list(SPARK_EVENT_LOG_FORMATS)
+        self.quota_usage_supported = True
+        self.summaries_avoided = 0
+        logger.debug("using %r as hdfs url", self.nn_hosts)
+
+    @asynccontextmanager
+    async def request(self, method: str, path: str, op: str, **params: str):
+        """send WebHDFS operation to the active namenode, failing over to the
+        next host on connection errors or StandbyException"""
+        exc: Exception | None = None
+        # concurrent requests reorder the shared list, try a snapshot of it
+        for host in list(self.nn_hosts):
+            req = self.http.build_request(
+                method,
+                f"{host}/webhdfs/v1{quote(path)}",
+                params={"op": op, **params},
             )
-        session = Session()
-        session.verify = False
-        self.hdfs = KerberosClient(url, session=session)
-        logger.debug("using %r as hdfs url", url)
+            try:
+                r = await self.http.send(req, stream=True)
+            except TransportError as e:
+                logger.warning("unable to connect to %s: %s", host, e)
+                exc = e
+                continue
+            try:
+                if r.status_code >= 400:
+                    err = HDFSError.from_response(
+                        r.status_code, r.headers, await r.aread()
+                    )
+                    if isinstance(err, StandbyError):
+                        logger.debug("%s is in standby state", host)
+                        exc = err
+                        continue
+                    raise err
+                if self.nn_hosts[0] != host:
+                    self.nn_hosts.remove(host)
+                    self.nn_hosts.insert(0, host)
+                yield r
+                return
+            finally:
+                await r.aclose()
+        if exc is None:
+            msg = "no namenode host is configured"
+            raise RuntimeError(msg)
+        raise exc
 
-    async def aread(self, path: str):
-        with await wrap_async(self.hdfs.read, path) as f:
-            f = cast("HTTPResponse", f)
-            return BytesIO(await wrap_async(f.read))
+    async def _get(self, path: str, op: str, **params: str):
+        async with self.request("GET", path, op, **params) as r:
+            return await r.aread()
 
-    async def spark_sql(self, app_id: str):
-        try:
-            with await self.aread(f"/user/spark/applicationHistory/{app_id}") as buf:
-                for i in buf:
-                    try:
-                        yield await wrap_async(
-                            SparkListenerSQLExecutionStart.decode_json, i
-                        )
-                    except ValidationError:
-                        pass
-        except HdfsError as e:
-            if "not found." not in e.message:
-                raise
-            logger.warning(e.message)
-
-    def content(self, path: str):
+    async def iter_lines(
+        self,
+        path: str,
+        chunk_size: int = 1 << 20,
+        decoder: StreamDecoder | None = None,
+    ):
+        """stream file content line by line, holding at most one chunk plus the
+        line spanning the chunk boundary in memory"""
+        if decoder is None:
+            decoder = PlainDecoder()
+        pending: builtins.list[bytes] = []
+        async with self.request("GET", path, "OPEN", buffersize=str(chunk_size)) as r:
+            async for raw in r.aiter_bytes(chunk_size):
+                if not (chunk := decoder.decompress(raw)):
+                    continue
+                lines = chunk.split(b"\n")
+                if len(lines) == 1:
+                    pending.append(chunk)
+                    continue
+                if pending:
+                    pending.append(lines[0])
+                    lines[0] = b"".join(pending)
+                    pending.clear()
+                if tail := lines.pop():
+                    pending.append(tail)
+                for line in lines:
+                    yield line
+        if pending:
+            yield b"".join(pending)
+
+    async def event_logs(self, app_id: str, attempt_id: str | None = None):
+        """event log files of an application attempt in read order, resolving
+        compressed, in-progress and rolling (eventlog_v2) layouts"""
+        name = f"{app_id}_{attempt_id}" if attempt_id else app_id
+        # concurrent calls reorder the shared list, probe a snapshot of it
+        for fmt in list(self.event_log_formats):
+            path = f"{SPARK_EVENT_LOG_DIR}/{fmt.format(name)}"
+            try:
+                fs = await self.status(path)
+            except PathNotFoundError:
+                continue
+            if self.event_log_formats[0] != fmt:
+                self.event_log_formats.remove(fmt)
+                self.event_log_formats.insert(0, fmt)
+            if fs.type is not FileType.DIRECTORY:
+                return [path]
+            segments = [
+                x
+                for x in await self.list(path)
+                if x.rpartition("/")[2].startswith("events_")
+            ]
+            return sorted(segments, key=event_log_index)
+        logger.warning("event log for %s is not found in %s", name, SPARK_EVENT_LOG_DIR)
+        return []
+
+    async def spark_sql(
+        self,
+        app_id: str,
+        attempt_id: str | None = None,
+        batch_size: int = 64,
+    ):
+        """only lines containing the event name are decoded, in batches off the
+        event loop, everything else is skipped without parsing"""
+        batch: builtins.list[bytes] = []
+        for path in await self.event_logs(app_id, attempt_id):
+            try:
+                async for line in self.iter_lines(path, decoder=get_decoder(path)):
+                    if SQL_EXECUTION_START not in line:
+                        continue
+                    batch.append(line)
+                    if len(batch) >= batch_size:
+                        for event in await wrap_async(decode_sql_events, batch):
+                            yield event
+                        batch = []
+            except PathNotFoundError as e:
+                logger.warning(e.message)
+        if batch:
+            for event in await wrap_async(decode_sql_events, batch):
+                yield event
+
+    async def content(self, path: str):
         return ContentSummary.decode_json(
-            self.hdfs._get_content_summary(path, strict=True).content  # type: ignore
+            await self._get(path, "GETCONTENTSUMMARY")
         ).ContentSummary
 
+    async def quota_usage(self, path: str):
+        return QuotaUsage.decode_json(await self._get(path, "GETQUOTAUSAGE")).QuotaUsage
+
+    async def usage(self, path: str):
+        """quota and usage of path from GETQUOTAUSAGE, falling back to the
+        content summary when the namenode does not support it"""
+        if self.quota_usage_supported:
+            try:
+                usage = await self.quota_usage(path)
+            except HDFSError as e:
+                if isinstance(e, PathNotFoundError) or e.status != 400:
+                    raise
+                logger.warning("GETQUOTAUSAGE is not supported: %s", e.message)
+                self.quota_usage_supported = False
+            else:
+                # without a quota the namenode still walks the subtree
+                if usage.has_quota:
+                    self.summaries_avoided += 1
+                return usage
+        return await self.content(path)
+
     @overload
-    def list(self, path: str) -> builtins.list[str]: ...
+    async def list(self, path: str) -> builtins.list[str]: ...
     @overload
-    def list(
+    async def list(
         self,
         path: str,
         status: Literal[True],
     ) -> builtins.list[tuple[str, FileStatusProperties]]: ...
     @overload
-    def list(
+    async def list(
         self,
         path: str,
         status: bool = False,
     ) -> builtins.list[str] | builtins.list[tuple[str, FileStatusProperties]]: ...
-    def list(self, path: str, status: bool = False):
-        full_path = self.hdfs.resolve(path)
+    async def list(self, path: str, status: bool = False):
         statuses = FileStatuses.decode_json(
-            self.hdfs._list_status(full_path).content  # type: ignore
+            await self._get(path, "LISTSTATUS")
         ).FileStatuses.FileStatus
         match statuses:
             case [fs] if (
-                not fs.pathSuffix or self.status(full_path).type is FileType.FILE
+                not fs.pathSuffix or (await self.status(path)).type is FileType.FILE
             ):
-                err = f"{full_path} is not a directory"
+                err = f"{path} is not a directory"
                 raise TypeError(err)
+        path = path.rstrip("/")
         if status:
             return [(f"{path}/{x.pathSuffix}", x) for x in statuses]
         return [f"{path}/{x.pathSuffix}" for x in statuses]
 
-    def status(self, path: str):
-        return FileStatus.decode_json(
-            self.hdfs._get_file_status(path, strict=True).content  # type: ignore
-        ).FileStatus
+    async def list_batch(self, path: str):
+        """iterate directory entries with LISTSTATUS_BATCH, fetching one page
+        (dfs.ls.limit entries) at a time"""
+        path = path.rstrip("/")
+        params: dict[str, str] = {}
+        while True:
+            listing = DirectoryListing.decode_json(
+                await self._get(path or "/", "LISTSTATUS_BATCH", **params)
+            ).DirectoryListing
+            statuses = listing.partialListing.FileStatuses.FileStatus
+            for x in statuses:
+                yield f"{path}/{x.pathSuffix}", x
+            if listing.remainingEntries < 1 or not statuses:
+                break
+            params["startAfter"] = statuses[-1].pathSuffix
+
+    async def status(self, path: str):
+        return FileStatus.decode_json(await self._get(path, "GETFILESTATUS")).FileStatus
@@ -1,18 +1,78 @@
 import logging
+from asyncio.tasks import gather
+from datetime import datetime
+from functools import cache
+from urllib.parse import urlparse
+
+from httpx import Limits
+from msgspec import json
 
 from cdp_metric_collector.cm_lib.errors import HTTPNotOK
-from cdp_metric_collector.cm_lib.hdfs.structs import DFSHealth
+from cdp_metric_collector.cm_lib.hdfs.structs import (
+    DFSHealth,
+    FSNamesystem,
+    FSNamesystemState,
+    JMXBean,
+    JMXBeanT,
+    JMXResponse,
+    NameNodeActivity,
+    RpcActivity,
+)
 from cdp_metric_collector.cm_lib.kerberos import KerberosClientBase
-from cdp_metric_collector.cm_lib.utils import wrap_async
+from cdp_metric_collector.cm_lib.utils import ABC, wrap_async
 
 logger = logging.getLogger(__name__)
 
+JMX_QUERIES: dict[str, type[JMXBean]] = {
+    "Hadoop:service=NameNode,name=FSNamesystem": FSNamesystem,
+    "Hadoop:service=NameNode,name=FSNamesystemState": FSNamesystemState,
+    "Hadoop:service=NameNode,name=RpcActivityForPort*": RpcActivity,
+    "Hadoop:service=NameNode,name=NameNodeActivity": NameNodeActivity,
+}
+
+
+@cache
+def jmx_decoder(bean: type[JMXBeanT]) -> json.Decoder[JMXResponse[JMXBeanT]]:
+    return json.Decoder(JMXResponse[bean])
+
+
+class JMXSnapshot(ABC):
+    time: datetime
+    beans: dict[str, list[JMXBean]]
+
+    def __init__(self, time: datetime) -> None:
+        self.time = time
+        self.beans = {}
+
+    def state(self, host: str):
+        for bean in self.beans.get(host, ()):
+            if isinstance(bean, FSNamesystem):
+                return bean.HAState
+        return ""
+
+    def rows(self):
+        """(time, host, HA state, bean, metric, value)"""
+        time = self.time.isoformat(" ", "seconds")
+        for host, beans in self.beans.items():
+            state = self.state(host)
+            hostname = urlparse(host).hostname or host
+            for bean in beans:
+                name = bean.name.rpartition("name=")[2]
+                for metric, value in bean.metrics():
+                    yield time, hostname, state, name, metric, value
+
 
 class NameNodeClient(KerberosClientBase):
     nn_hosts: list[str]
 
-    def __init__(self, urls: list[str]) -> None:
-        super().__init__("")
+    def __init__(self, urls: list[str], max_connections: int = 8) -> None:
+        super().__init__(
+            "",
+            limits=Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
         self.nn_hosts = urls
 
     async def health_status(self):
@@ -38,3 +98,29 @@ class NameNodeClient(KerberosClientBase):
                     self.nn_hosts.insert(0, self.nn_hosts.pop(n))
                 return await wrap_async(DFSHealth.decode_json, body)
         raise HTTPNotOK(status_code, headers, body.decode())
+
+    async def jmx(self, host: str, qry: str, bean: type[JMXBeanT]):
+        r = await self.http.get(f"{host}/jmx", params={"qry": qry})
+        if r.status_code >= 400:
+            raise HTTPNotOK(r.status_code, r.headers, r.text)
+        return jmx_decoder(bean).decode(r.content).beans
+
+    async def snapshot(self, queries: dict[str, type[JMXBean]] = JMX_QUERIES):
+        """query every bean on every namenode concurrently, a failed query
+        leaves its beans out of the snapshot"""
+        snapshot = JMXSnapshot(datetime.now())
+        jobs = [
+            (host, qry, bean) for host in self.nn_hosts for qry, bean in queries.items()
+        ]
+        results = await gather(
+            *(self.jmx(host, qry, bean) for host, qry, bean in jobs),
+            return_exceptions=True,
+        )
+        for (host, qry, _), result in zip(jobs, results, strict=True):
+            if isinstance(result, Exception):
+                logger.warning("unable to query %s from %s: %s", qry, host, result)
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            snapshot.beans.setdefault(host, []).extend(result)
+        return snapshot
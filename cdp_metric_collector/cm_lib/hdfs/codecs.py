@@ -0,0 +1,163 @@
+"""streaming decoders for spark event log compression codecs"""
+
+from cdp_metric_collector.cm_lib.utils import ABC, abstractmethod
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
+
+
+class StreamDecoder(ABC):
+    @abstractmethod
+    def decompress(self, data: bytes) -> bytes: ...
+
+
+class PlainDecoder(StreamDecoder):
+    def decompress(self, data: bytes):
+        return data
+
+
+class BlockDecoder(StreamDecoder):
+    """decoder for length-prefixed block streams, keeps incomplete blocks
+    buffered until the next chunk arrives"""
+
+    buf: bytearray
+
+    def __init__(self) -> None:
+        self.buf = bytearray()
+
+    def decompress(self, data: bytes):
+        self.buf += data
+        out: list[bytes] = []
+        pos = 0
+        while (n := self.read_block(pos, out)) > 0:
+            pos += n
+        del self.buf[:pos]
+        return b"".join(out)
+
+    @abstractmethod
+    def read_block(self, pos: int, out: list[bytes]) -> int:
+        """append decoded block starting at pos to out, returns consumed bytes
+        or 0 if the block is incomplete"""
+
+
+class LZ4BlockDecoder(BlockDecoder):
+    """lz4-java LZ4BlockOutputStream format used by spark lz4 codec"""
+
+    MAGIC = b"LZ4Block"
+    HEADER_LENGTH = 21
+    METHOD_RAW = 0x10
+    METHOD_LZ4 = 0x20
+
+    lz4: "Any"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.lz4 = import_codec("cramjam", "lz4").lz4
+
+    def read_block(self, pos: int, out: list[bytes]):
+        if len(self.buf) - pos < self.HEADER_LENGTH:
+            return 0
+        header = self.buf[pos : pos + self.HEADER_LENGTH]
+        if header[:8] != self.MAGIC:
+            err = "invalid lz4 block header"
+            raise ValueError(err)
+        method = header[8] & 0xF0
+        compressed = int.from_bytes(header[9:13], "little")
+        original = int.from_bytes(header[13:17], "little")
+        end = pos + self.HEADER_LENGTH + compressed
+        if len(self.buf) < end:
+            return 0
+        block = bytes(self.buf[pos + self.HEADER_LENGTH : end])
+        match method:
+            case self.METHOD_RAW:
+                out.append(block)
+            case self.METHOD_LZ4:
+                out.append(bytes(self.lz4.decompress_block(block, output_len=original)))
+            case _:
+                err = f"unknown lz4 block method {method:#x}"
+                raise ValueError(err)
+        return end - pos
+
+
+class SnappyDecoder(BlockDecoder):
+    """snappy-java SnappyOutputStream format used by spark snappy codec"""
+
+    MAGIC = b"\x82SNAPPY\x00"
+    HEADER_LENGTH = 16
+
+    snappy: "Any"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.snappy = import_codec("cramjam", "snappy").snappy
+
+    def read_block(self, pos: int, out: list[bytes]):
+        if len(self.buf) - pos < 4:
+            return 0
+        # a block length never starts with 0x82, so this is a (concatenated)
+        # stream header
+        if self.buf[pos] == self.MAGIC[0]:
+            if len(self.buf) - pos < self.HEADER_LENGTH:
+                return 0
+            if self.buf[pos : pos + 8] != self.MAGIC:
+                err = "invalid snappy stream header"
+                raise ValueError(err)
+            return self.HEADER_LENGTH
+        length = int.from_bytes(self.buf[pos : pos + 4], "big")
+        end = pos + 4 + length
+        if len(self.buf) < end:
+            return 0
+        out.append(bytes(self.snappy.decompress_raw(bytes(self.buf[pos + 4 : end]))))
+        return end - pos
+
+
+class ZstdDecoder(StreamDecoder):
+    zstd: "Any"
+    obj: "Any"
+
+    def __init__(self) -> None:
+        self.zstd = import_codec("zstandard", "zstd").ZstdDecompressor()
+        self.obj = self.zstd.decompressobj()
+
+    def decompress(self, data: bytes):
+        out: list[bytes] = []
+        while data:
+            out.append(self.obj.decompress(data))
+            if not self.obj.eof:
+                break
+            data = self.obj.unused_data
+            self.obj = self.zstd.decompressobj()
+        return b"".join(out)
+
+
+def import_codec(module: str, codec: str):
+    from importlib import import_module
+
+    try:
+        return import_module(module)
+    except ImportError as e:
+        err = (
+            f"reading {codec} compressed event logs requires {module}, "
+            "install cdp-metric-collector[compression]"
+        )
+        raise RuntimeError(err) from e
+
+
+CODECS = ("lz4", "snappy", "zstd")
+
+
+def get_decoder(path: str) -> StreamDecoder:
+    name = path.rpartition("/")[2].removesuffix(".inprogress").removesuffix(".compact")
+    match name.rpartition(".")[2]:
+        case "lz4":
+            return LZ4BlockDecoder()
+        case "snappy":
+            return SnappyDecoder()
+        case "zstd":
+            return ZstdDecoder()
+        case "lzf":
+            err = f"lzf compressed event log {path} is not supported"
+            raise ValueError(err)
+        case _:
+            return PlainDecoder()
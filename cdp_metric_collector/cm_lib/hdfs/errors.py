@@ -0,0 +1,45 @@
+from msgspec import DecodeError
+
+from cdp_metric_collector.cm_lib.errors import HTTPNotOK
+
+from .structs import RemoteExceptionResponse
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
+
+
+class HDFSError(HTTPNotOK):
+    def __init__(
+        self,
+        status: int,
+        header: "Any",
+        page: str,
+        exception: str = "",
+        message: str = "",
+    ) -> None:
+        super().__init__(status, header, page)
+        self.exception = exception
+        self.message = message or page
+
+    @classmethod
+    def from_response(cls, status: int, header: "Any", body: bytes):
+        try:
+            remote = RemoteExceptionResponse.decode_json(body).RemoteException
+        except DecodeError:
+            return cls(status, header, body.decode())
+        err_cls = cls
+        match remote.exception:
+            case "FileNotFoundException":
+                err_cls = PathNotFoundError
+            case "StandbyException":
+                err_cls = StandbyError
+        return err_cls(status, header, body.decode(), remote.exception, remote.message)
+
+
+class PathNotFoundError(HDFSError):
+    pass
+
+
+class StandbyError(HDFSError):
+    pass
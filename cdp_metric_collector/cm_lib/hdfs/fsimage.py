@@ -0,0 +1,367 @@
+"""offline namespace usage from `hdfs oiv` output (Delimited or XML processor)"""
+
+import logging
+import os
+from datetime import datetime
+from itertools import pairwise
+from xml.etree import ElementTree as ET
+
+from cdp_metric_collector.cm_lib.utils import ABC, abstractmethod, pretty_size
+
+logger = logging.getLogger(__name__)
+
+S_IFDIR = 0o0040000
+S_IFREG = 0o0100000
+S_IFLNK = 0o0120000
+DELIMITED_COLUMNS = (
+    "Path",
+    "Replication",
+    "ModificationTime",
+    "AccessTime",
+    "PreferredBlockSize",
+    "BlocksCount",
+    "FileSize",
+    "NSQUOTA",
+    "DSQUOTA",
+    "Permission",
+    "UserName",
+    "GroupName",
+)
+
+
+def symbolic_mode(perm: str):
+    """drwxr-xr-t style permission to st_mode"""
+    match perm[:1]:
+        case "d":
+            mode = S_IFDIR
+        case "l":
+            mode = S_IFLNK
+        case _:
+            mode = S_IFREG
+    for i, c in enumerate(perm[1:10]):
+        if c not in "-ST":
+            mode |= 1 << (8 - i)
+    if perm[3:4] in ("s", "S"):
+        mode |= 0o4000
+    if perm[6:7] in ("s", "S"):
+        mode |= 0o2000
+    if perm[9:10] in ("t", "T"):
+        mode |= 0o1000
+    return mode
+
+
+class UsageAggregator(ABC):
+    """per base path directory totals and emitted entries, directory totals
+    are kept only for directories within max_level"""
+
+    bases: list[str]
+    base_levels: list[int]
+    max_level: int | None
+    dir_only: bool
+    date_newer: datetime | None
+    date_older: datetime | None
+    totals: list[dict[str, list[int]]]
+    dirs: list[dict[str, tuple[str, str, str, str, str]]]
+    files: list[list[tuple[int | str, ...]]]
+
+    def __init__(
+        self,
+        bases: list[str],
+        max_level: int | None = None,
+        dir_only: bool = False,
+        date_newer: datetime | None = None,
+        date_older: datetime | None = None,
+    ):
+        self.bases = [x.rstrip("/") for x in bases]
+        self.base_levels = [x.count("/") for x in self.bases]
+        self.max_level = max_level
+        self.dir_only = dir_only
+        self.date_newer = date_newer
+        self.date_older = date_older
+        self.totals = [{} for _ in bases]
+        self.dirs = [{} for _ in bases]
+        self.files = [[] for _ in bases]
+
+    @abstractmethod
+    def parse_time(self, value: str) -> datetime: ...
+
+    @abstractmethod
+    def parse_mode(self, value: str, is_dir: bool) -> int: ...
+
+    def add(
+        self,
+        path: str,
+        is_dir: bool,
+        size: int,
+        usage: int,
+        mtime: str,
+        atime: str,
+        perm: str,
+        owner: str,
+        group: str,
+    ):
+        for n, base in enumerate(self.bases):
+            if not path.startswith(base + "/") or path == "/":
+                continue
+            level = path.count("/") - self.base_levels[n]
+            totals = self.totals[n]
+            # every ancestor below base within max_level
+            pos = len(base)
+            for _ in range(
+                level - 1 if self.max_level is None else min(level - 1, self.max_level)
+            ):
+                pos = path.index("/", pos + 1)
+                if (t := totals.get(path[:pos])) is None:
+                    t = totals[path[:pos]] = [0, 0, 0]
+                t[0] += size
+                t[1] += usage
+                t[2] += 1
+            if self.max_level is not None and level > self.max_level:
+                continue
+            if is_dir:
+                if (t := totals.get(path)) is None:
+                    t = totals[path] = [0, 0, 0]
+                t[2] += 1
+            elif self.dir_only:
+                continue
+            mdate = self.parse_time(mtime)
+            if (self.date_newer is not None and mdate <= self.date_newer) or (
+                self.date_older is not None and mdate >= self.date_older
+            ):
+                continue
+            meta = (
+                "%o" % self.parse_mode(perm, is_dir),
+                owner,
+                group,
+                self.parse_time(atime).isoformat(" "),
+                mdate.isoformat(" "),
+            )
+            if is_dir:
+                self.dirs[n][path] = meta
+            else:
+                self.files[n].append(
+                    (
+                        level,
+                        meta[0],
+                        path,
+                        *meta[1:],
+                        str(size),
+                        pretty_size(size),
+                        str(usage),
+                        pretty_size(usage),
+                        "1",
+                    )
+                )
+
+    def merge(self, other: "UsageAggregator"):
+        for n in range(len(self.bases)):
+            totals = self.totals[n]
+            for path, t in other.totals[n].items():
+                if (cur := totals.get(path)) is None:
+                    totals[path] = t
+                else:
+                    cur[0] += t[0]
+                    cur[1] += t[1]
+                    cur[2] += t[2]
+            self.dirs[n].update(other.dirs[n])
+            self.files[n].extend(other.files[n])
+
+    def rows(self, n: int):
+        """rows of base n in the same layout as HeaderField, in path order"""
+        totals = self.totals[n]
+        result = self.files[n]
+        for path, (mode, owner, group, atime, mtime) in self.dirs[n].items():
+            size, usage, count = totals.get(path, (0, 0, 1))
+            result.append(
+                (
+                    path.count("/") - self.base_levels[n],
+                    mode,
+                    path,
+                    owner,
+                    group,
+                    atime,
+                    mtime,
+                    str(size),
+                    pretty_size(size),
+                    str(usage),
+                    pretty_size(usage),
+                    str(count),
+                )
+            )
+        result.sort(key=lambda x: x[2].split("/"))
+        return result
+
+
+class DelimitedAggregator(UsageAggregator):
+    def parse_time(self, value: str):
+        return datetime.strptime(value, "%Y-%m-%d %H:%M")
+
+    def parse_mode(self, value: str, is_dir: bool):
+        return symbolic_mode(value)
+
+
+class XMLAggregator(UsageAggregator):
+    def parse_time(self, value: str):
+        return datetime.fromtimestamp(int(value, 10) / 1000)
+
+    def parse_mode(self, value: str, is_dir: bool):
+        perm = value.rpartition(":")[2]
+        if perm.isdigit():
+            return (S_IFDIR if is_dir else S_IFREG) | int(perm, 8)
+        return symbolic_mode(("d" if is_dir else "-") + perm)
+
+
+def is_xml(fp: str):
+    with open(fp, "rb") as f:
+        return f.read(64).lstrip().startswith((b"<?xml", b"<fsimage"))
+
+
+def delimited_header(fp: str, delimiter: str):
+    """column indexes and offset of the first data line"""
+    with open(fp, "rb") as f:
+        first = f.readline()
+    fields = first.decode().rstrip("\r\n").split(delimiter)
+    if fields[0] != "Path":
+        return {x: n for n, x in enumerate(DELIMITED_COLUMNS)}, 0
+    missing = [x for x in DELIMITED_COLUMNS if x not in fields]
+    if missing:
+        err = f"{fp} is missing delimited columns {', '.join(missing)}"
+        raise ValueError(err)
+    return {x: fields.index(x) for x in DELIMITED_COLUMNS}, len(first)
+
+
+def shards(fp: str, start: int, n: int):
+    """split [start, size) into n byte ranges, lines belong to the range they
+    start in"""
+    size = os.path.getsize(fp)
+    step = max((size - start) // n, 1)
+    bounds = [*range(start, size, step), size]
+    return list(pairwise(bounds))
+
+
+def parse_delimited(
+    fp: str,
+    start: int,
+    end: int,
+    columns: dict[str, int],
+    delimiter: str,
+    agg: DelimitedAggregator,
+):
+    path_i = columns["Path"]
+    repl_i = columns["Replication"]
+    mtime_i = columns["ModificationTime"]
+    atime_i = columns["AccessTime"]
+    size_i = columns["FileSize"]
+    perm_i = columns["Permission"]
+    user_i = columns["UserName"]
+    group_i = columns["GroupName"]
+    with open(fp, "rb") as f:
+        if start > 0:
+            f.seek(start - 1)
+            f.readline()
+        pos = f.tell()
+        while pos < end and (line := f.readline()):
+            pos += len(line)
+            row = line.decode("utf-8", "replace").rstrip("\r\n").split(delimiter)
+            perm = row[perm_i]
+            if perm.startswith("l"):
+                continue
+            is_dir = perm.startswith("d")
+            size = int(row[size_i], 10)
+            repl = int(row[repl_i], 10)
+            agg.add(
+                row[path_i],
+                is_dir,
+                size,
+                size * repl if repl > 0 else size,
+                row[mtime_i],
+                row[atime_i],
+                perm,
+                row[user_i],
+                row[group_i],
+            )
+    return agg
+
+
+def xml_records(fp: str, *sections: str):
+    """yield (section, record) for records directly under the given sections
+    of an fsimage xml, records are released once the consumer resumes and
+    parsing stops after the last section"""
+    depth = 0
+    pending = set(sections)
+    parent: ET.Element | None = None
+    for event, elem in ET.iterparse(fp, ("start", "end")):
+        if event == "start":
+            depth += 1
+            if depth == 2:
+                parent = elem
+            continue
+        depth -= 1
+        if depth == 2 and parent is not None:
+            if parent.tag in pending:
+                yield parent.tag, elem
+            parent.clear()
+        elif depth == 1:
+            pending.discard(elem.tag)
+            if not pending:
+                return
+
+
+def parse_xml(fp: str, agg: XMLAggregator):
+    """two streaming passes, the first one maps child inode to parent and
+    directory inode to name, the second one resolves paths"""
+    names: dict[int, str] = {}
+    parents: dict[int, int] = {}
+    for section, elem in xml_records(fp, "INodeSection", "INodeDirectorySection"):
+        match section, elem.tag:
+            case "INodeSection", "inode" if elem.findtext("type") == "DIRECTORY":
+                names[int(elem.findtext("id", "0"), 10)] = elem.findtext("name", "")
+            case "INodeDirectorySection", "directory":
+                parent = int(elem.findtext("parent", "0"), 10)
+                for child in elem.iterfind("child"):
+                    parents[int(child.text or "0", 10)] = parent
+    logger.debug("found %s directories and %s inodes", len(names), len(parents))
+
+    paths: dict[int, str] = {}
+
+    def dir_path(inode: int) -> str | None:
+        if (path := paths.get(inode)) is not None:
+            return path
+        if (parent := parents.get(inode)) is None:
+            # root inode has no parent
+            path = "" if names.get(inode) == "" else None
+        elif (ppath := dir_path(parent)) is not None and inode in names:
+            path = f"{ppath}/{names[inode]}"
+        else:
+            path = None
+        if path is not None:
+            paths[inode] = path
+        return path
+
+    for _, elem in xml_records(fp, "INodeSection"):
+        if elem.tag != "inode":
+            continue
+        inode = int(elem.findtext("id", "0"), 10)
+        kind = elem.findtext("type")
+        if kind not in ("FILE", "DIRECTORY") or inode not in parents:
+            continue
+        if (ppath := dir_path(parents[inode])) is None:
+            continue
+        size = sum(
+            int(x.text or "0", 10) for x in elem.iterfind("blocks/block/numBytes")
+        )
+        repl = int(elem.findtext("replication", "0"), 10)
+        mtime = elem.findtext("mtime", "0")
+        owner, group, _ = elem.findtext("permission", "::").split(":", 2)
+        agg.add(
+            f"{ppath}/{elem.findtext('name', '')}",
+            kind == "DIRECTORY",
+            size,
+            size * repl if repl > 0 else size,
+            mtime,
+            elem.findtext("atime", mtime),
+            elem.findtext("permission", ""),
+            owner,
+            group,
+        )
+    return agg
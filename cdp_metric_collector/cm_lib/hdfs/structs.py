@@ -1,10 +1,10 @@
 from enum import Enum
-from typing import Any, Literal
+from typing import Any, Generic, Literal, TypeVar
 
-from msgspec import UNSET, Struct, UnsetType, json
+from msgspec import UNSET, Struct, UnsetType, field, json, structs
 
 from cdp_metric_collector.cm_lib.structs import Decodable
-from cdp_metric_collector.cm_lib.utils import ABC, pretty_size
+from cdp_metric_collector.cm_lib.utils import pretty_size
 
 
 class FileType(Enum):
@@ -33,6 +33,10 @@ class ContentSummaryProperties(Struct):
     spaceQuota: int  # The disk space quota.
     typeQuota: QuotaType
 
+    @property
+    def fileAndDirectoryCount(self):
+        return self.fileCount + self.directoryCount
+
     @property
     def length_hr(self):
         return pretty_size(self.length)
@@ -57,6 +61,37 @@ class ContentSummary(Decodable):
     ContentSummary: ContentSummaryProperties
 
 
+class QuotaUsageProperties(Struct):
+    fileAndDirectoryCount: int  # The number of files and directories.
+    quota: int  # The namespace quota of this directory.
+    spaceConsumed: int  # The disk space consumed by the content.
+    spaceQuota: int  # The disk space quota.
+    typeQuota: QuotaType | UnsetType = UNSET
+
+    @property
+    def has_quota(self):
+        return self.quota >= 0 or self.spaceQuota >= 0
+
+    @property
+    def spaceConsumed_hr(self):
+        return pretty_size(self.spaceConsumed)
+
+    @property
+    def spaceQuota_hr(self):
+        return pretty_size(self.spaceQuota)
+
+    @property
+    def spaceConsumed_perc(self):
+        if self.spaceQuota > 0:
+            perc = self.spaceConsumed / self.spaceQuota
+            return f"{perc:.2%}"
+        return "0.00%"
+
+
+class QuotaUsage(Decodable):
+    QuotaUsage: QuotaUsageProperties
+
+
 class FileStatusProperties(Struct):
     accessTime: int  # The access time.
     blockSize: int  # The block size of a file.
@@ -87,53 +122,76 @@ class FileStatuses(Decodable):
     FileStatuses: FileStatusArray
 
 
-# namenode info at https://namenode_host/jmx
+class DirectoryListingProperties(Struct):
+    partialListing: FileStatuses
+    remainingEntries: int
+
+
+class DirectoryListing(Decodable):
+    DirectoryListing: DirectoryListingProperties
+
 
+class RemoteExceptionProperties(Struct):
+    exception: str
+    message: str
+    javaClassName: str = ""
 
-class Addr(ABC):
-    host: str
-    port: int
 
-    def __init__(self, value: str):
-        host, _, port = value.partition(":")
-        self.host = host
-        self.port = int(port, 10)
+class RemoteExceptionResponse(Decodable):
+    RemoteException: RemoteExceptionProperties
 
-    def __hash__(self):
-        return hash((self.host, self.port))
+
+# namenode info at https://namenode_host/jmx
 
 
-class NodeStatus(Struct):
+class NodeStatus(Struct, gc=False):
     lastContact: int
-    xferaddr: Addr
+    xferaddr: str
+    adminState: str = ""
     volfails: int | UnsetType = UNSET
     failedStorageIDs: list[str] | UnsetType = UNSET
     lastVolumeFailureDate: int | UnsetType = UNSET
-    # usedSpace: int
-    # capacity: int
-    # remaining: int
-    # numBlocks: int
+    usedSpace: int | UnsetType = UNSET
+    capacity: int | UnsetType = UNSET
+    remaining: int | UnsetType = UNSET
+    numBlocks: int | UnsetType = UNSET
+
+    @property
+    def xferhost(self):
+        return self.xferaddr.rpartition(":")[0]
+
+    @property
+    def utilization(self):
+        if self.usedSpace is UNSET or not self.capacity:
+            return None
+        return self.usedSpace / self.capacity
+
 
+class Nodes(dict[str, NodeStatus]):
+    """datanode name (host:port) to status"""
 
-class Nodes(dict[Addr, NodeStatus]):
     __slots__ = ()
 
+    def by_host(self):
+        for name, status in self.items():
+            yield name.rpartition(":")[0], status
+
 
-class NameNodeInfo(Struct):
+class NameNodeInfo(Struct, gc=False):
     LiveNodes: Nodes
     DeadNodes: Nodes
 
 
 def DFSHealth_dec_hook(t: type, v: "Any") -> "Any":
     if t is Nodes:
+        # LiveNodes/DeadNodes are json documents embedded as strings, decode
+        # them straight into structs with str keys
         return Nodes(NodesJDec.decode(v))
-    elif t is Addr:
-        return Addr(v)
     err = f"type {type} is not implemented"
     raise NotImplementedError(err)
 
 
-NodesJDec = json.Decoder(dict[Addr, NodeStatus], dec_hook=DFSHealth_dec_hook)
+NodesJDec = json.Decoder(dict[str, NodeStatus])
 
 
 class DFSHealth(Decodable):
@@ -142,6 +200,106 @@ class DFSHealth(Decodable):
     beans: list[NameNodeInfo]
 
 
+class JMXBean(Struct, kw_only=True):
+    name: str
+    modelerType: str = ""
+
+    def metrics(self):
+        """(metric, value) of every set field except name and tags"""
+        for f in structs.fields(self):
+            if f.name in ("name", "modelerType") or f.encode_name.startswith("tag."):
+                continue
+            if (value := getattr(self, f.name)) is not UNSET:
+                yield f.encode_name, value
+
+
+class FSNamesystem(JMXBean, kw_only=True):
+    HAState: str = field(default="", name="tag.HAState")
+    CapacityTotal: int | UnsetType = UNSET
+    CapacityUsed: int | UnsetType = UNSET
+    CapacityRemaining: int | UnsetType = UNSET
+    CapacityUsedNonDFS: int | UnsetType = UNSET
+    BlocksTotal: int | UnsetType = UNSET
+    FilesTotal: int | UnsetType = UNSET
+    MissingBlocks: int | UnsetType = UNSET
+    MissingReplOneBlocks: int | UnsetType = UNSET
+    CorruptBlocks: int | UnsetType = UNSET
+    UnderReplicatedBlocks: int | UnsetType = UNSET
+    PendingReplicationBlocks: int | UnsetType = UNSET
+    PendingDeletionBlocks: int | UnsetType = UNSET
+    ScheduledReplicationBlocks: int | UnsetType = UNSET
+    ExcessBlocks: int | UnsetType = UNSET
+    StaleDataNodes: int | UnsetType = UNSET
+    TotalLoad: int | UnsetType = UNSET
+    LastCheckpointTime: int | UnsetType = UNSET
+    TransactionsSinceLastCheckpoint: int | UnsetType = UNSET
+    TransactionsSinceLastLogRoll: int | UnsetType = UNSET
+    LastWrittenTransactionId: int | UnsetType = UNSET
+    SnapshottableDirectories: int | UnsetType = UNSET
+    Snapshots: int | UnsetType = UNSET
+
+
+class FSNamesystemState(JMXBean, kw_only=True):
+    FSState: str | UnsetType = UNSET
+    NumLiveDataNodes: int | UnsetType = UNSET
+    NumDeadDataNodes: int | UnsetType = UNSET
+    NumDecomLiveDataNodes: int | UnsetType = UNSET
+    NumDecomDeadDataNodes: int | UnsetType = UNSET
+    NumDecommissioningDataNodes: int | UnsetType = UNSET
+    NumInMaintenanceLiveDataNodes: int | UnsetType = UNSET
+    NumStaleDataNodes: int | UnsetType = UNSET
+    NumStaleStorages: int | UnsetType = UNSET
+    VolumeFailuresTotal: int | UnsetType = UNSET
+    EstimatedCapacityLostTotal: int | UnsetType = UNSET
+    TotalSyncCount: int | UnsetType = UNSET
+    NumEncryptionZones: int | UnsetType = UNSET
+
+
+class RpcActivity(JMXBean, kw_only=True):
+    port: str = field(default="", name="tag.port")
+    ReceivedBytes: int | UnsetType = UNSET
+    SentBytes: int | UnsetType = UNSET
+    RpcQueueTimeNumOps: int | UnsetType = UNSET
+    RpcQueueTimeAvgTime: float | UnsetType = UNSET
+    RpcProcessingTimeNumOps: int | UnsetType = UNSET
+    RpcProcessingTimeAvgTime: float | UnsetType = UNSET
+    RpcAuthenticationFailures: int | UnsetType = UNSET
+    RpcAuthorizationFailures: int | UnsetType = UNSET
+    RpcClientBackoff: int | UnsetType = UNSET
+    RpcSlowCalls: int | UnsetType = UNSET
+    NumOpenConnections: int | UnsetType = UNSET
+    NumDroppedConnections: int | UnsetType = UNSET
+    CallQueueLength: int | UnsetType = UNSET
+
+
+class NameNodeActivity(JMXBean, kw_only=True):
+    CreateFileOps: int | UnsetType = UNSET
+    FilesCreated: int | UnsetType = UNSET
+    FilesAppended: int | UnsetType = UNSET
+    GetBlockLocations: int | UnsetType = UNSET
+    FilesRenamed: int | UnsetType = UNSET
+    GetListingOps: int | UnsetType = UNSET
+    DeleteFileOps: int | UnsetType = UNSET
+    FilesDeleted: int | UnsetType = UNSET
+    FileInfoOps: int | UnsetType = UNSET
+    AddBlockOps: int | UnsetType = UNSET
+    TransactionsNumOps: int | UnsetType = UNSET
+    TransactionsAvgTime: float | UnsetType = UNSET
+    SyncsNumOps: int | UnsetType = UNSET
+    SyncsAvgTime: float | UnsetType = UNSET
+    BlockReportNumOps: int | UnsetType = UNSET
+    BlockReportAvgTime: float | UnsetType = UNSET
+    SafeModeTime: int | UnsetType = UNSET
+    FsImageLoadTime: int | UnsetType = UNSET
+
+
+JMXBeanT = TypeVar("JMXBeanT", bound=JMXBean)
+
+
+class JMXResponse(Struct, Generic[JMXBeanT]):
+    beans: list[JMXBeanT]
+
+
 class SparkListenerSQLExecutionStart(Decodable):
     Event: Literal["org.apache.spark.sql.execution.ui.SparkListenerSQLExecutionStart"]
     executionId: int
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+from datetime import datetime
+
+from msgspec import Struct
+
+from cdp_metric_collector.cm_lib.hdfs.errors import HDFSError
+from cdp_metric_collector.cm_lib.hdfs.structs import (
+    ContentSummaryProperties,
+    FileStatusProperties,
+    FileType,
+)
+from cdp_metric_collector.cm_lib.utils import ordered_map, pretty_size
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from cdp_metric_collector.cm_lib.hdfs.client import HDFSClient
+
+logger = logging.getLogger(__name__)
+
+
+class WalkEntry(Struct):
+    path: str
+    status: FileStatusProperties
+    summary: ContentSummaryProperties | None = None
+
+    @property
+    def mode(self):
+        perm = int(self.status.permission, 8)
+        if self.is_dir():
+            return 0o0040000 | perm
+        return 0o0100000 | perm
+
+    @property
+    def atime(self):
+        return self.status.accessTime
+
+    @property
+    def mtime(self):
+        return self.status.modificationTime
+
+    def is_dir(self):
+        return self.status.type is FileType.DIRECTORY
+
+    def is_file(self):
+        return self.status.type is FileType.FILE
+
+    @property
+    def size(self):
+        if self.summary is not None:
+            return self.summary.length
+        return self.status.length
+
+    @property
+    def usage(self):
+        if self.summary is not None:
+            return self.summary.spaceConsumed
+        return self.status.length * self.status.replication
+
+    @property
+    def count(self):
+        if self.summary is not None:
+            return self.summary.fileAndDirectoryCount
+        return 1
+
+    def __iter__(self):
+        """same columns as FileBrowserPathJSON"""
+        yield "%o" % self.mode
+        yield self.path
+        yield self.status.owner
+        yield self.status.group
+        yield datetime.fromtimestamp(self.atime / 1000).isoformat(" ")
+        yield datetime.fromtimestamp(self.mtime / 1000).isoformat(" ")
+        yield str(self.size)
+        yield pretty_size(self.size)
+        yield str(self.usage)
+        yield pretty_size(self.usage)
+        yield str(self.count)
+
+
+async def walk(
+    client: "HDFSClient",
+    path: str,
+    max_depth: int | None = None,
+    concurrency: int = 8,
+    summary: bool = True,
+    include: "Callable[[WalkEntry], bool] | None" = None,
+):
+    """walk the namespace under path breadth first, one depth level at a time.
+    directories of a level are listed concurrently and yielded in listing
+    order, with a content summary per directory if summary is set. entries
+    rejected by include are still descended into but not yielded nor
+    summarized"""
+    rpc = asyncio.Semaphore(concurrency)
+
+    async def expand(dir_path: str):
+        entries: list[WalkEntry] = []
+        try:
+            async with rpc:
+                async for fp, status in client.list_batch(dir_path):
+                    entries.append(WalkEntry(fp, status))
+        except HDFSError as e:
+            logger.warning("unable to list %s: %s", dir_path, e.message)
+        subdirs = [x.path for x in entries if x.is_dir()]
+        if include is not None:
+            entries = [x for x in entries if include(x)]
+        if summary:
+            await asyncio.gather(*(fetch_summary(x) for x in entries if x.is_dir()))
+        return subdirs, entries
+
+    async def fetch_summary(entry: WalkEntry):
+        try:
+            async with rpc:
+                entry.summary = await client.content(entry.path)
+        except HDFSError as e:
+            logger.warning("unable to get summary of %s: %s", entry.path, e.message)
+
+    level = [path]
+    depth = 1
+    while level and (max_depth is None or depth <= max_depth):
+        logger.debug("walking %s paths at depth %s", len(level), depth)
+        next_level: list[str] = []
+        async for subdirs, entries in ordered_map(expand, level, concurrency):
+            next_level.extend(subdirs)
+            for entry in entries:
+                yield depth, entry
+        level = next_level
+        depth += 1
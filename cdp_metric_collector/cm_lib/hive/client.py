@@ -1,7 +1,10 @@
 import contextlib
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from io import StringIO
+from queue import Empty, SimpleQueue
+from threading import Lock
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -12,13 +15,16 @@ from typing import (
     cast,
     overload,
 )
+from urllib.parse import unquote
 
 from impala.dbapi import connect
+from impala.error import Error
 from msgspec import convert
 
+from cdp_metric_collector.cm_lib import config
 from cdp_metric_collector.cm_lib.utils import ABC
 
-from .structs import HiveDatabase
+from .structs import HiveDatabase, HiveLocation
 
 if TYPE_CHECKING:
     from collections.abc import Callable
@@ -27,6 +33,37 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+SYS_DBS_QUERY = "SELECT name, db_location_uri, owner_name FROM sys.dbs"
+SYS_TABLES_QUERY = (
+    "SELECT d.name, t.tbl_name, '', s.location FROM sys.tbls t "
+    "JOIN sys.dbs d ON t.db_id = d.db_id "
+    "JOIN sys.sds s ON t.sd_id = s.sd_id"
+)
+SYS_PARTITIONS_QUERY = (
+    "SELECT d.name, t.tbl_name, p.part_name, s.location FROM sys.partitions p "
+    "JOIN sys.tbls t ON p.tbl_id = t.tbl_id "
+    "JOIN sys.dbs d ON t.db_id = d.db_id "
+    "JOIN sys.sds s ON p.sd_id = s.sd_id"
+)
+
+
+def partition_spec(part_name: str):
+    """k1=v1/k2=v2 partition name to k1='v1', k2='v2' partition spec"""
+    spec: list[str] = []
+    for kv in part_name.split("/"):
+        key, _, value = kv.partition("=")
+        value = unquote(value).replace("\\", "\\\\").replace("'", "\\'")
+        spec.append(f"`{unquote(key)}`='{value}'")
+    return ", ".join(spec)
+
+
+def described_location(cur: "HiveServer2Cursor", target: str):
+    cur.execute(f"desc formatted {target}")
+    return next(
+        (str(x[1]).strip() for x in cur.fetchall() if str(x[0]).strip() == "Location:"),
+        "",
+    )
+
 
 _RT = TypeVar("_RT")
 _PT = ParamSpec("_PT")
@@ -49,10 +86,15 @@ class HiveClient(ABC):
     _hivecon: "HiveServer2Connection"
     _hivecur: "HiveServer2Cursor"
     _initialized: bool
+    _pool: "list[HiveServer2Connection]"
+    _pool_idle: "SimpleQueue[HiveServer2Cursor]"
+    _pool_lock: Lock
     hive_url: str
     url_group: tuple[str, ...]
+    pool_size: int
+    sys_dbs_supported: bool
 
-    def __init__(self, hive_url: str) -> None:
+    def __init__(self, hive_url: str, pool_size: int | None = None) -> None:
         url_group = re.match(
             r"jdbc:(?:hive2|impala)://(.*?):(\d+)/.*?"
             r"(?<=principal=)(.*?)(?:/(.*?)@.*?)?(?=;|$).*?"
@@ -67,6 +109,11 @@ class HiveClient(ABC):
         self._initialized = False
         self.hive_url = hive_url
         self.url_group = url_group.groups()
+        self.pool_size = max(pool_size or config.HIVE_POOL_SIZE, 1)
+        self._pool = []
+        self._pool_idle = SimpleQueue()
+        self._pool_lock = Lock()
+        self.sys_dbs_supported = True
 
     def __enter__(self):
         self.connect()
@@ -77,10 +124,26 @@ class HiveClient(ABC):
     def __exit__(self, *exc: Any):
         self._hivecur.__exit__(*exc)
         self._hivecon.__exit__(*exc)
+        with self._pool_lock:
+            for con in self._pool[1:]:
+                con.close()
+            self._pool.clear()
+            self._pool_idle = SimpleQueue()
         logger.debug("hive connection closed")
         self._initialized = False
 
     def connect(self) -> None:
+        self._hivecon = self._open()
+        self._hivecur = cast(
+            "HiveServer2Cursor",
+            self._hivecon.cursor(convert_types=False),
+        )
+        self._pool.append(self._hivecon)
+        self._pool_idle.put(self._hivecur)
+        self._initialized = True
+        logger.debug("connected to %r", self.hive_url)
+
+    def _open(self) -> "HiveServer2Connection":
         host, port, krb_name, krb_host, ssl = self.url_group
         port = int(port, 10)
         ssl = ssl.lower() == "true"
@@ -101,7 +164,7 @@ class HiveClient(ABC):
             contextlib.redirect_stderr(err),
         ):
             try:
-                self._hivecon = connect(
+                return connect(
                     host,
                     port,
                     auth_mechanism="GSSAPI",
@@ -111,12 +174,30 @@ class HiveClient(ABC):
                 )
             except Exception as e:
                 raise RuntimeError(err.getvalue()) from e
-        self._hivecur = cast(
-            "HiveServer2Cursor",
-            self._hivecon.cursor(convert_types=False),
-        )
-        self._initialized = True
-        logger.debug("connected to %r", self.hive_url)
+
+    @contextlib.contextmanager
+    @ensure_init
+    def cursor(self):
+        """borrow an idle cursor of the pool, opening a new connection while
+        the pool is below pool_size and waiting for one to be returned
+        otherwise"""
+        try:
+            cur = self._pool_idle.get_nowait()
+        except Empty:
+            with self._pool_lock:
+                if len(self._pool) < self.pool_size:
+                    con = self._open()
+                    self._pool.append(con)
+                    logger.debug("opened hive connection %s", len(self._pool))
+                    cur = cast("HiveServer2Cursor", con.cursor(convert_types=False))
+                else:
+                    cur = None
+            if cur is None:
+                cur = self._pool_idle.get()
+        try:
+            yield cur
+        finally:
+            self._pool_idle.put(cur)
 
     @overload
     def databases(self) -> list[str]: ...
@@ -124,14 +205,100 @@ class HiveClient(ABC):
     def databases(self, expand: Literal[True]) -> list[HiveDatabase]: ...
     @overload
     def databases(self, expand: bool = False) -> list[HiveDatabase] | list[str]: ...
-    @ensure_init
     def databases(self, expand: bool = False):
-        self._hivecur.execute("show databases")
-        if expand:
-            return sorted(self.database(str(x[0])) for x in self._hivecur.fetchall())
-        return sorted(str(x[0]) for x in self._hivecur)
+        if expand and self.sys_dbs_supported:
+            if (dbs := self.databases_bulk()) is not None:
+                return dbs
+        with self.cursor() as cur:
+            cur.execute("show databases")
+            names = [str(x[0]) for x in cur.fetchall()]
+        if not expand:
+            return sorted(names)
+        # describes are spread over the connection pool
+        with ThreadPoolExecutor(min(self.pool_size, len(names) or 1)) as e:
+            return sorted(e.map(self.database, names))
+
+    def query_sys(self, query: str, batch_size: int = 1000):
+        """rows of a query on the metastore sys database fetched in batches,
+        None if the sys database is not available"""
+        result: list[tuple[Any, ...]] = []
+        with self.cursor() as cur:
+            try:
+                cur.execute(query)
+            except Error as e:
+                logger.warning("unable to query sys database, falling back: %s", e)
+                self.sys_dbs_supported = False
+                return None
+            while rows := cur.fetchmany(batch_size):
+                result.extend(rows)
+        return result
+
+    def databases_bulk(self, batch_size: int = 1000):
+        """every database from the metastore sys.dbs table in a single query,
+        None if the sys database is not available"""
+        if (rows := self.query_sys(SYS_DBS_QUERY, batch_size)) is None:
+            return None
+        return sorted(
+            HiveDatabase(
+                name=str(name),
+                comment="",
+                location=str(location or ""),
+                location_managed="",
+                owner=str(owner or ""),
+                owner_type="",
+                param="",
+            )
+            for name, location, owner in rows
+        )
+
+    def locations(self, batch_size: int = 1000):
+        """locations of every table and partition, read from the sys database
+        with two queries or described per table otherwise"""
+        if self.sys_dbs_supported:
+            tables = self.query_sys(SYS_TABLES_QUERY, batch_size)
+            partitions = self.query_sys(SYS_PARTITIONS_QUERY, batch_size)
+            if tables is not None and partitions is not None:
+                return sorted(
+                    HiveLocation(*(str(x or "") for x in row))
+                    for row in (*tables, *partitions)
+                )
+        with ThreadPoolExecutor(self.pool_size) as e:
+            return sorted(
+                x
+                for locs in e.map(self.table_locations, self.databases())
+                for x in locs
+            )
+
+    def table_locations(self, database: str):
+        """table and partition locations of database, one describe per table
+        and per partition"""
+        result: list[HiveLocation] = []
+        with self.cursor() as cur:
+            cur.execute(f"show tables in {database}")
+            tables = [str(x[0]) for x in cur.fetchall()]
+            for table in tables:
+                name = f"{database}.{table}"
+                location = described_location(cur, name)
+                result.append(HiveLocation(database, table, "", location))
+                try:
+                    cur.execute(f"show partitions {name}")
+                except Error:
+                    # not a partitioned table
+                    continue
+                result.extend(
+                    HiveLocation(
+                        database,
+                        table,
+                        part,
+                        described_location(
+                            cur, f"{name} partition ({partition_spec(part)})"
+                        ),
+                    )
+                    for part in [str(x[0]) for x in cur.fetchall()]
+                )
+        return result
 
-    @ensure_init
     def database(self, name: str):
-        self._hivecur.execute(f"desc schema {name}")
-        return convert(self._hivecur.fetchone(), HiveDatabase)
+        with self.cursor() as cur:
+            cur.execute(f"desc schema {name}")
+            return convert(cur.fetchone(), HiveDatabase)
@@ -24,3 +24,13 @@ class HiveDatabase(Struct, array_like=True):
 
     def __lt__(self, other: "Self"):
         return self.name.__lt__(other.name)
+
+
+class HiveLocation(Struct, array_like=True, order=True):
+    """storage location of a table, or of one of its partitions when
+    partition is set"""
+
+    database: str
+    table: str
+    partition: str
+    location: str
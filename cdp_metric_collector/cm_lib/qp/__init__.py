@@ -1,9 +1,11 @@
 __all__ = (
     "DagInfoData",
     "HUEQPClient",
+    "QueryDetailCache",
     "QueryInfo",
 )
 
 
+from .cache import QueryDetailCache
 from .client import HUEQPClient
 from .structs import DagInfoData, QueryInfo
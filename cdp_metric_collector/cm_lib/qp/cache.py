@@ -0,0 +1,114 @@
+import logging
+import sqlite3
+from time import monotonic, time
+
+from cdp_metric_collector.cm_lib.utils import ABC, wrap_async
+
+from .structs import QueryExtendedInfo
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("SUCCESS", "ERROR", "FAILED", "KILLED", "CANCELLED")
+
+
+class QueryDetailCache(ABC):
+    """raw query detail responses of finished queries keyed by query id,
+    least recently used entries are evicted once the bodies exceed max_size
+    bytes. changes are committed at most commit_interval seconds apart"""
+
+    conn: sqlite3.Connection
+    max_size: int
+    size: int
+    hits: int
+    commit_interval: float
+    committed: float
+
+    def __init__(
+        self,
+        fp: "Path | str",
+        max_size: int = 1 << 30,
+        commit_interval: float = 10.0,
+    ) -> None:
+        self.conn = sqlite3.connect(fp)
+        self.conn.executescript("""
+        PRAGMA journal_mode = WAL;
+        PRAGMA synchronous = NORMAL;
+        CREATE TABLE IF NOT EXISTS query_detail (
+            query_id TEXT NOT NULL PRIMARY KEY,
+            body BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            accessed INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS query_detail_accessed_IDX ON query_detail (accessed);
+        """)
+        self.max_size = max_size
+        (self.size,) = self.conn.execute(
+            "SELECT coalesce(sum(size), 0) FROM query_detail"
+        ).fetchone()
+        self.hits = 0
+        self.commit_interval = commit_interval
+        self.committed = monotonic()
+        if self.size > self.max_size:
+            self.evict(self.max_size * 9 // 10)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc: object):
+        self.conn.commit()
+        self.conn.execute("PRAGMA optimize")
+        self.conn.close()
+        logger.debug("query detail cache closed after %s hits", self.hits)
+
+    def checkpoint(self):
+        if monotonic() - self.committed >= self.commit_interval:
+            self.conn.commit()
+            self.committed = monotonic()
+
+    async def get(self, query_id: str):
+        row = self.conn.execute(
+            "SELECT body FROM query_detail WHERE query_id = ?", (query_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        self.conn.execute(
+            "UPDATE query_detail SET accessed = ? WHERE query_id = ?",
+            (int(time() * 1000), query_id),
+        )
+        self.hits += 1
+        self.checkpoint()
+        return await wrap_async(QueryExtendedInfo.decode_json, row[0])
+
+    def put(self, query_id: str, body: bytes, status: str):
+        if status not in TERMINAL_STATUSES:
+            return
+        cur = self.conn.execute(
+            "INSERT OR IGNORE INTO query_detail VALUES (?, ?, ?, ?)",
+            (query_id, body, len(body), int(time() * 1000)),
+        )
+        self.size += len(body) * cur.rowcount
+        if self.size > self.max_size:
+            self.evict(self.max_size * 9 // 10)
+        else:
+            self.checkpoint()
+
+    def evict(self, target: int):
+        """drop least recently used entries until the bodies fit target bytes"""
+        victims: list[tuple[str]] = []
+        freed = 0
+        for query_id, size in self.conn.execute(
+            "SELECT query_id, size FROM query_detail ORDER BY accessed"
+        ):
+            if self.size - freed <= target:
+                break
+            victims.append((query_id,))
+            freed += size
+        self.conn.executemany("DELETE FROM query_detail WHERE query_id = ?", victims)
+        self.size -= freed
+        self.conn.commit()
+        self.committed = monotonic()
+        logger.debug("evicted %s cached query details", len(victims))
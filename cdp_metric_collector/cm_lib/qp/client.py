@@ -26,6 +26,11 @@ class HUEQPClient(APIClientBase):
         self.http.headers.update({"x-do-as": config.HUE_USER})
 
     async def query_detail(self, query_id: str):
+        return await wrap_async(
+            QueryExtendedInfo.decode_json, await self.query_detail_raw(query_id)
+        )
+
+    async def query_detail_raw(self, query_id: str):
         async with self.http.get(
             "/api/hive/query",
             ssl=False,
@@ -41,7 +46,7 @@ class HUEQPClient(APIClientBase):
                     r.headers,
                 )
                 raise HTTPNotOK(r.status, r.headers, await r.text())
-            return await wrap_async(QueryExtendedInfo.decode_json, await r.read())
+            return await r.read()
 
     async def search_query(
         self,
@@ -2,7 +2,7 @@ from collections.abc import Callable
 from datetime import datetime
 from typing import Any, ClassVar, Self
 
-from msgspec import Struct, json, structs, yaml
+from msgspec import Struct, json, msgpack, structs, yaml
 
 
 class Progressive(Struct):
@@ -34,6 +34,7 @@ class DTNoTZ(Struct):
 
 class Decodable(Struct):
     __jdec__: ClassVar[json.Decoder[Self]]
+    __mdec__: ClassVar[msgpack.Decoder[Self]]
     __dec_hook__: ClassVar[Callable[[type, Any], Any] | None] = None
 
     @classmethod
@@ -44,6 +45,14 @@ class Decodable(Struct):
             cls.__jdec__ = json.Decoder(cls, dec_hook=cls.__dec_hook__)
             return cls.__jdec__.decode(data)
 
+    @classmethod
+    def decode_msgpack(cls, data: bytes, /):
+        try:
+            return cls.__mdec__.decode(data)
+        except AttributeError:
+            cls.__mdec__ = msgpack.Decoder(cls, dec_hook=cls.__dec_hook__)
+            return cls.__mdec__.decode(data)
+
     @classmethod
     def decode_yaml(cls, data: bytes, /):
         return yaml.decode(data, type=cls, dec_hook=cls.__dec_hook__)
@@ -9,16 +9,18 @@ __all__ = (
     "encode_json_str",
     "ensure_api_ver",
     "join_url",
+    "ordered_map",
     "parse_auth",
     "pretty_size",
     "setup_logging",
     "strfdelta",
+    "unordered_map",
     "wrap_async",
 )
 
 
 from ._abc import ABC, ARGSBase, ARGSWithAuthBase, ConvertibleToString, abstractmethod
-from .aiohelpers import wrap_async
+from .aiohelpers import ordered_map, unordered_map, wrap_async
 from .helpers import (
     JSON_ENC,
     calc_perc,
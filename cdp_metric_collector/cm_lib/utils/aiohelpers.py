@@ -1,13 +1,15 @@
 import asyncio
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 from typing import TYPE_CHECKING, ParamSpec, TypeVar
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Awaitable, Callable, Iterable
 
 _P = ParamSpec("_P")
 _T = TypeVar("_T")
+_R = TypeVar("_R")
 
 
 loop: asyncio.AbstractEventLoop
@@ -29,3 +31,66 @@ async def wrap_async(
         loop = asyncio.get_running_loop()
     with ThreadPoolExecutor(1) as e:
         return await loop.run_in_executor(e, partial(func, *args, **kwargs))
+
+
+async def ordered_map(
+    func: "Callable[[_T], Awaitable[_R]]",
+    items: "Iterable[_T]",
+    concurrency: int,
+    window: int | None = None,
+):
+    """run func over items with at most concurrency calls in flight and yield
+    results in input order, tasks keep running up to window items ahead of a
+    slow one"""
+    if concurrency < 1:
+        err = "concurrency must be at least 1"
+        raise ValueError(err)
+    sem = asyncio.Semaphore(concurrency)
+
+    async def run(item: "_T"):
+        async with sem:
+            return await func(item)
+
+    window = max(window or concurrency * 4, concurrency)
+    pending: deque[asyncio.Task[_R]] = deque()
+    try:
+        for item in items:
+            pending.append(asyncio.create_task(run(item)))
+            if len(pending) >= window:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def unordered_map(
+    func: "Callable[[_T], Awaitable[_R]]",
+    items: "Iterable[_T]",
+    concurrency: int,
+):
+    """run func over items with at most concurrency calls in flight and yield
+    results as they complete"""
+    if concurrency < 1:
+        err = "concurrency must be at least 1"
+        raise ValueError(err)
+    pending: set[asyncio.Task[_R]] = set()
+    try:
+        for item in items:
+            pending.add(asyncio.create_task(func(item)))
+            if len(pending) >= concurrency:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
@@ -15,14 +15,17 @@ type Arguments struct {
 	_Parser *arg.Parser    `arg:"-"`
 	_Outf   io.WriteCloser `arg:"-"`
 
-	Paths    []string `arg:"positional,required" placeholder:"PATH"`
-	Out      string   `arg:"-o,--" placeholder:"FILE" default:"-"`
-	Append   bool     `arg:"--append" help:"append output to FILE"`
-	DirOnly  bool     `arg:"--dir-only" help:"only export directories"`
-	DateMax  DateTime `arg:"--older-than" placeholder:"TIME" default:"9999-12-31"`
-	DateMin  DateTime `arg:"--newer-than" placeholder:"TIME"  default:"0000-01-01"`
-	MaxDepth int      `arg:"-d,--max-depth" placeholder:"NUM"  default:"-1"`
-	Verbose  bool     `arg:"-v,--verbose" help:"enable debug logging"`
+	Paths     []string `arg:"positional,required" placeholder:"PATH"`
+	Out       string   `arg:"-o,--" placeholder:"FILE" default:"-"`
+	Append    bool     `arg:"--append" help:"append output to FILE"`
+	DirOnly   bool     `arg:"--dir-only" help:"only export directories"`
+	DateMax   DateTime `arg:"--older-than" placeholder:"TIME" default:"9999-12-31"`
+	DateMin   DateTime `arg:"--newer-than" placeholder:"TIME"  default:"0000-01-01"`
+	MaxDepth  int      `arg:"-d,--max-depth" placeholder:"NUM"  default:"-1"`
+	Parallel  int      `arg:"-p,--parallel" placeholder:"NUM" default:"1" help:"number of concurrent directory walkers"`
+	Sorted    bool     `arg:"--sorted" help:"sort output by path within each depth level"`
+	Aggregate bool     `arg:"--aggregate" help:"compute directory totals from listings instead of content summaries"`
+	Verbose   bool     `arg:"-v,--verbose" help:"enable debug logging"`
 }
 
 func (a *Arguments) String() string {
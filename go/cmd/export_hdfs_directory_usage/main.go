@@ -7,7 +7,7 @@ import (
 	"github.com/unhealme/cdp-metric-collector/go/internal/hdfs"
 )
 
-const Version = "r2026.03.30-0"
+const Version = "r2026.10.19-1"
 
 var (
 	logger = internal.DefaultLogger()
@@ -49,8 +49,17 @@ func main() {
 	if !args.Append {
 		fw.Write(outputField)
 	}
+	opts := hdfs.WalkOptions{
+		DateMin:   args.DateMin.Time,
+		DateMax:   args.DateMax.Time,
+		MaxDepth:  args.MaxDepth,
+		DirOnly:   args.DirOnly,
+		Parallel:  args.Parallel,
+		Sorted:    args.Sorted,
+		Aggregate: args.Aggregate,
+	}
 	for _, p := range args.Paths {
-		walker, err := c.Walk2(p, args.DateMin.Time, args.DateMax.Time, args.MaxDepth, args.DirOnly)
+		walker, err := c.Walk2(p, opts)
 		if err != nil {
 			logger.Warn("unable to walk path", logger.Args("path", p, "error", err))
 			continue
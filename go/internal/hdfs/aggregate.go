@@ -0,0 +1,150 @@
+package hdfs
+
+import (
+	"os"
+	"path/filepath"
+	"sync"
+
+	hdfs "github.com/colinmarc/hdfs/v2"
+	"github.com/unhealme/cdp-metric-collector/go/internal"
+)
+
+// aggEntry is an entry within MaxDepth of an aggregated walk, directory
+// totals are complete once every deeper level has been rolled up into it.
+type aggEntry struct {
+	HDFSPath
+	mu     sync.Mutex
+	parent *aggEntry
+	emit   bool
+}
+
+func (e *aggEntry) add(size, usage, count int64) {
+	e.mu.Lock()
+	e.size += size
+	e.usage += usage
+	e.count += count
+	e.mu.Unlock()
+}
+
+// aggDir is a directory waiting to be listed. anchor is the entry its content
+// is accounted to, the directory itself within MaxDepth, its deepest ancestor
+// within MaxDepth otherwise.
+type aggDir struct {
+	path   string
+	anchor *aggEntry
+}
+
+// consumed is the raw disk usage of a file, length times replication. Erasure
+// coded files report no replication and are counted at their length.
+func consumed(info *hdfs.FileInfo) int64 {
+	if st, ok := info.Sys().(interface{ GetBlockReplication() uint32 }); ok && st.GetBlockReplication() > 0 {
+		return info.Size() * int64(st.GetBlockReplication())
+	}
+	return info.Size()
+}
+
+func newAggregatedPath(info *hdfs.FileInfo, fpath string, depth int) HDFSPath {
+	p := HDFSPath{FileInfo: info, fpath: fpath, depth: depth}
+	switch {
+	case info.IsDir():
+		p.count = 1
+	case info.Mode()&os.ModeSymlink == 0:
+		p.size, p.usage, p.count = info.Size(), consumed(info), 1
+	}
+	return p
+}
+
+func listAggregate(cl *hdfs.Client, dir aggDir, d int, within bool, opts *WalkOptions, stats *walkStats) ([]*aggEntry, []aggDir) {
+	logger.Debug("walking path", logger.Args("path", dir.path, "depth", d))
+	paths, err := cl.ReadDir(dir.path)
+	stats.dirs.Add(1)
+	stats.rpcs.Add(1)
+	if err != nil {
+		logger.Warn("unable to read path", logger.Args("name", dir.path, "error", err))
+		return nil, nil
+	}
+	var (
+		entries            []*aggEntry
+		next               []aggDir
+		size, usage, count int64
+	)
+	for _, path := range paths {
+		fname := filepath.Join(dir.path, path.Name())
+		p := newAggregatedPath(path.(*hdfs.FileInfo), fname, d)
+		if path.IsDir() {
+			anchor := dir.anchor
+			if within {
+				anchor = &aggEntry{HDFSPath: p, parent: dir.anchor, emit: opts.selected(path)}
+				entries = append(entries, anchor)
+			} else {
+				count += p.count
+			}
+			next = append(next, aggDir{fname, anchor})
+			continue
+		}
+		size += p.size
+		usage += p.usage
+		count += p.count
+		if within && opts.selected(path) {
+			entries = append(entries, &aggEntry{HDFSPath: p, emit: true})
+		}
+	}
+	dir.anchor.add(size, usage, count)
+	return entries, next
+}
+
+// walkAggregate lists every directory under first once and derives the
+// totals of emitted directories from the listings. Entries are held until the
+// walk completes, as a directory is only final after its whole subtree.
+func walkAggregate(clients []*hdfs.Client, first HDFSPath, opts *WalkOptions, stats *walkStats, fp chan<- HDFSPath) {
+	root := &aggEntry{HDFSPath: first, emit: true}
+	if !first.IsDir() {
+		fp <- root.HDFSPath
+		return
+	}
+	var (
+		mu     sync.Mutex
+		levels [][]*aggEntry
+		level  = []aggDir{{first.fpath, root}}
+	)
+	for d := 1; len(level) > 0; d++ {
+		var (
+			within  = internal.LimitReached(d, opts.MaxDepth)
+			entries []*aggEntry
+		)
+		logger.Info("walking paths", logger.Args("count", len(level), "depth", d, "max", opts.MaxDepth))
+		level = parallelLevel(clients, level, func(cl *hdfs.Client, dir aggDir) []aggDir {
+			found, next := listAggregate(cl, dir, d, within, opts, stats)
+			mu.Lock()
+			entries = append(entries, found...)
+			mu.Unlock()
+			return next
+		})
+		if within {
+			levels = append(levels, entries)
+		}
+	}
+	// post-order roll up, a level is complete before it is added to its parents
+	for d := len(levels) - 1; d >= 0; d-- {
+		for _, e := range levels[d] {
+			if e.IsDir() {
+				e.parent.add(e.size, e.usage, e.count)
+			}
+		}
+	}
+	fp <- root.HDFSPath
+	for _, entries := range levels {
+		var rows []HDFSPath
+		for _, e := range entries {
+			if e.emit {
+				rows = append(rows, e.HDFSPath)
+			}
+		}
+		if opts.Sorted {
+			sortRows(rows)
+		}
+		for _, r := range rows {
+			fp <- r
+		}
+	}
+}
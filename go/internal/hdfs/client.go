@@ -4,6 +4,10 @@ import (
 	"fmt"
 	"os"
 	"path/filepath"
+	"slices"
+	"strings"
+	"sync"
+	"sync/atomic"
 	"time"
 
 	hdfs "github.com/colinmarc/hdfs/v2"
@@ -16,67 +20,204 @@ import (
 
 var logger = internal.DefaultLogger()
 
-type HDFSClient struct{ *hdfs.Client }
+type HDFSClient struct {
+	*hdfs.Client
+	options hdfs.ClientOptions
+}
+
+type WalkOptions struct {
+	DateMin, DateMax time.Time
+	MaxDepth         int
+	DirOnly          bool
+	// Parallel is the number of worker goroutines listing directories of a
+	// depth level, each with its own namenode connection.
+	Parallel int
+	// Sorted emits each depth level ordered by path, buffering the level
+	// before it is sent.
+	Sorted bool
+	// Aggregate computes directory totals from the listings, rolled up from
+	// children to parents, instead of a GetContentSummary per entry.
+	Aggregate bool
+}
 
-func (c *HDFSClient) Walk2(basePath string, dateMin, dateMax time.Time, maxDepth int, dirOnly bool) (<-chan HDFSPath, error) {
+type walkStats struct {
+	dirs  atomic.Int64
+	rpcs  atomic.Int64
+	start time.Time
+}
+
+func (s *walkStats) log(basePath string) {
 	var (
-		fp chan HDFSPath
-		qp []string
+		elapsed = time.Since(s.start).Seconds()
+		dirs    = s.dirs.Load()
+		rpcs    = s.rpcs.Load()
+	)
+	logger.Info("walk finished", logger.Args(
+		"path", basePath,
+		"dirs", dirs,
+		"rpcs", rpcs,
+		"elapsed", fmt.Sprintf("%.2fs", elapsed),
+		"dirs/s", fmt.Sprintf("%.1f", float64(dirs)/elapsed),
+		"rpcs/s", fmt.Sprintf("%.1f", float64(rpcs)/elapsed),
+	))
+}
+
+// pool returns n clients sharing the configuration of c, the namenode
+// connection of a single client serializes its RPCs.
+func (c *HDFSClient) pool(n int) ([]*hdfs.Client, error) {
+	clients := []*hdfs.Client{c.Client}
+	for len(clients) < n {
+		cl, err := hdfs.NewClient(c.options)
+		if err != nil {
+			closePool(clients[1:])
+			return nil, err
+		}
+		clients = append(clients, cl)
+	}
+	return clients, nil
+}
+
+func closePool(clients []*hdfs.Client) {
+	for _, cl := range clients {
+		cl.Close()
+	}
+}
 
-		fetchPaths = func(p string, d int) {
-			paths, err := c.ReadDir(p)
+func fetchPaths(cl *hdfs.Client, p string, d int, opts *WalkOptions, stats *walkStats, emit func(HDFSPath)) []string {
+	logger.Debug("walking path", logger.Args("path", p, "depth", d))
+	paths, err := cl.ReadDir(p)
+	stats.dirs.Add(1)
+	stats.rpcs.Add(1)
+	if err != nil {
+		logger.Warn("unable to read path", logger.Args("name", p, "error", err))
+		return nil
+	}
+	var dirs []string
+	for _, path := range paths {
+		fname := filepath.Join(p, path.Name())
+		if path.IsDir() {
+			dirs = append(dirs, fname)
+		}
+		if opts.selected(path) {
+			content, err := cl.GetContentSummary(fname)
+			stats.rpcs.Add(1)
 			if err != nil {
-				logger.Warn("unable to read path", logger.Args("name", p, "error", err))
-				return
-			}
-			for _, path := range paths {
-				fname := filepath.Join(p, path.Name())
-				if path.IsDir() {
-					qp = append(qp, fname)
-				}
-				mt := path.ModTime()
-				if mt.Before(dateMax) && mt.After(dateMin) && !(dirOnly && !path.IsDir()) {
-					content, err := c.GetContentSummary(fname)
-					if err != nil {
-						continue
-					}
-					fp <- HDFSPath{path.(*hdfs.FileInfo), fname, content, d}
-				}
+				continue
 			}
+			emit(newHDFSPath(path.(*hdfs.FileInfo), fname, content, d))
 		}
+	}
+	return dirs
+}
+
+func (o *WalkOptions) selected(fi os.FileInfo) bool {
+	mt := fi.ModTime()
+	return mt.Before(o.DateMax) && mt.After(o.DateMin) && !(o.DirOnly && !fi.IsDir())
+}
+
+// parallelLevel spreads the items of one depth level across the client pool
+// and returns the items of the next level.
+func parallelLevel[T any](clients []*hdfs.Client, level []T, fetch func(*hdfs.Client, T) []T) []T {
+	var (
+		wg   sync.WaitGroup
+		mu   sync.Mutex
+		next []T
+		jobs = make(chan T)
 	)
+	for _, cl := range clients {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			for item := range jobs {
+				items := fetch(cl, item)
+				mu.Lock()
+				next = append(next, items...)
+				mu.Unlock()
+			}
+		}()
+	}
+	for _, item := range level {
+		jobs <- item
+	}
+	close(jobs)
+	wg.Wait()
+	return next
+}
+
+func sortRows(rows []HDFSPath) {
+	slices.SortFunc(rows, func(a, b HDFSPath) int { return strings.Compare(a.fpath, b.fpath) })
+}
+
+func (c *HDFSClient) Walk2(basePath string, opts WalkOptions) (<-chan HDFSPath, error) {
 	if !filepath.IsAbs(basePath) {
 		return nil, fmt.Errorf("%q is not an absolute path", basePath)
 	}
+	stats := &walkStats{start: time.Now()}
 	first_info, err := c.Stat(basePath)
 	if err != nil {
 		return nil, err
 	}
-	first_content, err := c.GetContentSummary(basePath)
+	stats.rpcs.Add(1)
+	var first HDFSPath
+	if opts.Aggregate {
+		first = newAggregatedPath(first_info.(*hdfs.FileInfo), basePath, 0)
+	} else {
+		first_content, err := c.GetContentSummary(basePath)
+		if err != nil {
+			return nil, err
+		}
+		stats.rpcs.Add(1)
+		first = newHDFSPath(first_info.(*hdfs.FileInfo), basePath, first_content, 0)
+	}
+	clients, err := c.pool(max(opts.Parallel, 1))
 	if err != nil {
 		return nil, err
 	}
-	fp = make(chan HDFSPath)
+	fp := make(chan HDFSPath, len(clients)*256)
 	go func() {
-		fp <- HDFSPath{first_info.(*hdfs.FileInfo), basePath, first_content, 0}
-		qp = append(qp, basePath)
-		var i []string
-		for d := 1; internal.LimitReached(d, maxDepth); d++ {
-			if len(qp) < 1 {
-				break
-			}
-			i = qp[:]
-			qp = nil
-			for _, p := range i {
-				logger.Info("walking paths", logger.Args("path", p, "depth", d, "max", maxDepth))
-				fetchPaths(p, d)
-			}
+		defer close(fp)
+		defer closePool(clients[1:])
+		if opts.Aggregate {
+			walkAggregate(clients, first, &opts, stats, fp)
+		} else {
+			walk(clients, first, &opts, stats, fp)
 		}
-		close(fp)
+		stats.log(basePath)
 	}()
 	return fp, nil
 }
 
+func walk(clients []*hdfs.Client, first HDFSPath, opts *WalkOptions, stats *walkStats, fp chan<- HDFSPath) {
+	var (
+		mu   sync.Mutex
+		rows []HDFSPath
+		emit = func(p HDFSPath) { fp <- p }
+	)
+	if opts.Sorted {
+		emit = func(p HDFSPath) {
+			mu.Lock()
+			rows = append(rows, p)
+			mu.Unlock()
+		}
+	}
+	fp <- first
+	level := []string{first.fpath}
+	for d := 1; len(level) > 0 && internal.LimitReached(d, opts.MaxDepth); d++ {
+		logger.Info("walking paths", logger.Args("count", len(level), "depth", d, "max", opts.MaxDepth))
+		level = parallelLevel(clients, level, func(cl *hdfs.Client, p string) []string {
+			return fetchPaths(cl, p, d, opts, stats, emit)
+		})
+		if opts.Sorted {
+			sortRows(rows)
+			for _, r := range rows {
+				fp <- r
+			}
+			rows = nil
+			slices.Sort(level)
+		}
+	}
+}
+
 func GetClient() (*HDFSClient, error) {
 	conf, err := hadoopconf.Load("/etc/hadoop/conf")
 	if err != nil {
@@ -102,5 +243,5 @@ func GetClient() (*HDFSClient, error) {
 	if err != nil {
 		return nil, err
 	}
-	return &HDFSClient{base}, nil
+	return &HDFSClient{base, co}, nil
 }
@@ -11,14 +11,27 @@ const ISOTimeFormat = "2006-01-02 15:04:05.999999"
 
 type HDFSPath struct {
 	*hdfs.FileInfo
-	fpath   string
-	content *hdfs.ContentSummary
-	depth   int
+	fpath string
+	size  int64 // length of the content
+	usage int64 // disk space consumed by the content
+	count int64 // number of files and directories
+	depth int
+}
+
+func newHDFSPath(info *hdfs.FileInfo, fpath string, content *hdfs.ContentSummary, depth int) HDFSPath {
+	return HDFSPath{
+		info,
+		fpath,
+		content.Size(),
+		content.SizeAfterReplication(),
+		int64(content.DirectoryCount() + content.FileCount()),
+		depth,
+	}
 }
 
 func (p *HDFSPath) ToRow() []string {
-	s := p.content.Size()
-	u := p.content.SizeAfterReplication()
+	s := p.size
+	u := p.usage
 	return []string{
 		strconv.Itoa(p.depth),
 		p.Mode().String(),
@@ -31,6 +44,6 @@ func (p *HDFSPath) ToRow() []string {
 		internal.FormatSize(float64(s)),
 		strconv.FormatInt(u, 10),
 		internal.FormatSize(float64(u)),
-		strconv.Itoa(p.content.DirectoryCount() + p.content.FileCount()),
+		strconv.FormatInt(p.count, 10),
 	}
 }